@@ -0,0 +1,134 @@
+# Backtest of the pregame edge report over a range of dates.
+# For each date the edges are rebuilt from only the games played before it, then joined
+# with the final scores, so we can check whether the edges predict anything.
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
+
+# The ingestion helpers live next to the data files
+sys.path.append(DATA_DIR)
+from lineup_store import load_lineups
+from edge_matrix import METRICS, EdgeMatrix, baselines_from_rates, stat_columns, team_rates, top_lineup_stats
+from schedule_store import SCHEDULE
+
+# Teams need this many earlier games before their matchups are scored
+MIN_GAMES = 5
+
+# Lineups per team that the edges are built from, same as the report
+TOP_N = 3
+
+# Columns the backtest reads from the lineup store
+BACKTEST_COLUMNS = ['game_id', 'team', 'lineup_key', 'minutes_played'] + stat_columns()
+
+
+def season_schedule():
+    """Regular season games from the local schedule store: game_id (int), date, teams and final scores (NaN if not played)."""
+    schedule = SCHEDULE.load().games.copy()
+    schedule['game_id'] = schedule['game_id'].astype(int)
+    schedule['date'] = pd.to_datetime(schedule['date']).dt.date
+    return schedule[['game_id', 'date', 'home_team', 'away_team', 'home_score', 'away_score']]
+
+
+# Worker state, set once per process by init_worker
+ROWS = None
+GAMES = None
+
+
+def init_worker(rows, schedule):
+    global ROWS, GAMES
+    ROWS = rows
+    GAMES = schedule
+
+
+def date_edges(report_date):
+    """
+    Edges of every game on report_date, using only the lineup rows of earlier games.
+
+    Returns:
+        list of dicts, one per scored game (both teams past MIN_GAMES)
+    """
+    earlier = GAMES.loc[GAMES['date'] < report_date, 'game_id']
+    rows = ROWS[ROWS['game_id'].isin(earlier)]
+    games_played = rows.groupby('team')['game_id'].nunique()
+    teams = games_played.index[games_played >= MIN_GAMES].tolist()
+    if len(teams) < 2:
+        return []
+
+    stats = top_lineup_stats(rows[rows['team'].isin(teams)], TOP_N).reindex(teams)
+    offense, defense = team_rates(stats)
+    league, means, stds = baselines_from_rates(offense, defense)
+    matchups = EdgeMatrix(teams, offense, defense, league, means, stds)
+
+    results = []
+    for game in GAMES[GAMES['date'] == report_date].itertuples():
+        if game.home_team not in matchups or game.away_team not in matchups:
+            continue
+        home_edges = matchups.edge(game.home_team, game.away_team)
+        away_edges = matchups.edge(game.away_team, game.home_team)
+        result = {
+            'date': report_date,
+            'game_id': game.game_id,
+            'home_team': game.home_team,
+            'away_team': game.away_team,
+            'home_score': game.home_score,
+            'away_score': game.away_score,
+        }
+        for i, metric in enumerate(METRICS):
+            result[f'home {metric.name}'] = home_edges[i]
+            result[f'away {metric.name}'] = away_edges[i]
+        results.append(result)
+    return results
+
+
+def run_backtest(start, end, schedule=None, workers=None):
+    """
+    Edge report for every game day in [start, end], run in parallel across processes.
+
+    Args:
+        start, end: first and last date (datetime.date).
+        schedule: season_schedule() frame (read from the schedule store if None).
+        workers: process count (defaults to the CPU count).
+
+    Returns:
+        DataFrame with one row per game: per-metric home/away edges plus the final score
+    """
+    if schedule is None:
+        schedule = season_schedule()
+    rows = load_lineups('S2', columns=BACKTEST_COLUMNS)
+
+    dates = sorted(d for d in schedule['date'].unique() if start <= d <= end)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(rows, schedule)) as pool:
+        for day in pool.map(date_edges, dates):
+            results.extend(day)
+
+    df = pd.DataFrame(results)
+    if not df.empty:
+        df['home_margin'] = df['home_score'] - df['away_score']
+    return df
+
+
+def summarize(df):
+    """Correlation of each metric's home-minus-away edge with the home margin, over finished games."""
+    finished = df.dropna(subset=['home_margin'])
+    for metric in METRICS:
+        diff = finished[f'home {metric.name}'] - finished[f'away {metric.name}']
+        corr = np.corrcoef(diff, finished['home_margin'])[0, 1] if len(finished) > 1 else float('nan')
+        print(f"{metric.name:<25} r = {corr:+.3f}  ({len(finished)} games)")
+
+
+if __name__ == "__main__":
+    # python backtest.py [start YYYY-MM-DD] [end YYYY-MM-DD]
+    schedule = season_schedule()
+    start = datetime.strptime(sys.argv[1], '%Y-%m-%d').date() if len(sys.argv) > 1 else schedule['date'].min()
+    end = datetime.strptime(sys.argv[2], '%Y-%m-%d').date() if len(sys.argv) > 2 else schedule['date'].max()
+
+    backtest = run_backtest(start, end, schedule)
+    backtest.to_csv('backtest_S2.csv', index=False)
+    summarize(backtest)
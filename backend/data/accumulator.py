@@ -0,0 +1,56 @@
+import time
+import pandas as pd
+
+
+class StintAccumulator:
+    """
+    Collects lineup-period records per team as column lists and builds DataFrames once per batch.
+
+    Appending a record is O(1) (no DataFrame is touched until drain()), and full() lets the
+    caller flush before the buffered rows grow past max_rows.
+
+    Args:
+        columns: column order of every record.
+        max_rows: buffered rows (all teams) after which full() returns True.
+    """
+
+    def __init__(self, columns, max_rows=100_000):
+        self.columns = list(columns)
+        self.max_rows = max_rows
+        self.buffers = {}
+        self.buffered = 0
+        self.total_rows = 0
+        self.started = time.perf_counter()
+
+    def add(self, team, record):
+        buffer = self.buffers.get(team)
+        if buffer is None:
+            buffer = self.buffers[team] = {col: [] for col in self.columns}
+        for col in self.columns:
+            buffer[col].append(record[col])
+        self.buffered += 1
+        self.total_rows += 1
+
+    def __len__(self):
+        return self.buffered
+
+    def full(self):
+        return self.buffered >= self.max_rows
+
+    def frame(self, team):
+        """DataFrame of the rows currently buffered for a team (empty if none)."""
+        return pd.DataFrame(self.buffers.get(team, {col: [] for col in self.columns}), columns=self.columns)
+
+    def drain(self):
+        """Return {team: DataFrame} for everything buffered and clear the buffers."""
+        frames = {team: pd.DataFrame(buffer, columns=self.columns) for team, buffer in self.buffers.items()}
+        self.buffers = {}
+        self.buffered = 0
+        return frames
+
+    def rows_per_second(self):
+        elapsed = time.perf_counter() - self.started
+        return self.total_rows / elapsed if elapsed > 0 else 0.0
+
+    def report(self):
+        print(f"{self.total_rows} lineup rows built ({self.rows_per_second():.0f} rows/sec)")
@@ -3,6 +3,7 @@
 from nba_api.stats.static import teams
 import pandas as pd
 import os
+from team_files import assign_game_numbers
 
 # Get list of all NBA team abbreviations (e.g., 'BOS', 'LAL')
 team_abbrevs = [team['abbreviation'] for team in teams.get_teams()]
@@ -17,15 +18,9 @@ for team_abbr in team_abbrevs:
         print(f"Skipping {csv_path} as CSV doesn't exist")
         continue
 
-    # Load the full dataset
-    df = pd.read_csv(csv_path)
-
-    # Sort and reset index
-    df = df.sort_values('game_id').reset_index(drop=True)
-
-    # Map game_id to game_number
-    game_id_map = {game_id: i + 1 for i, game_id in enumerate(df['game_id'].unique())}
-    df['game_number'] = df['game_id'].map(game_id_map)
+    # Load the full dataset and number its games (ingestion already does this on every write;
+    # this is only needed to repair files edited by hand)
+    df = assign_game_numbers(pd.read_csv(csv_path))
 
     # Save updated CSV
     df.to_csv(csv_path, index=False)
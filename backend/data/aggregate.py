@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+
+# Event counters kept for each side of a lineup-period group
+COUNTERS = [
+    'made_2pt', 'missed_2pt', 'made_3pt', 'missed_3pt', 'made_fts', 'missed_fts',
+    'rebounds', 'off_rebounds', 'assists', 'turnovers', 'fouls',
+    'fastbreak_2', 'fastbreak_3', 'from_turnover_2', 'from_turnover_3',
+    'second_chance_2', 'second_chance_3', 'points_in_paint',
+]
+
+# Regulation plus up to four overtimes
+MAX_PERIODS = 8
+
+# v2 play-by-play EVENTMSGTYPE -> v3 actionType. Field goals are split into
+# 2pt/3pt and free throws into made/missed from the description.
+V2_ACTION_TYPES = {
+    1: 'fg',
+    2: 'fg',
+    3: 'freethrow',
+    4: 'rebound',
+    5: 'turnover',
+    6: 'foul',
+}
+V2_SHOT_RESULTS = {1: 'Made', 2: 'Missed'}
+
+
+def normalize_v2_events(lineup_df):
+    """
+    Map a v2 (EVENTMSGTYPE) lineup tracking frame onto the v3 columns classify_events reads.
+
+    v2 has no subType or qualifiers, so offensive rebounds and the fastbreak/second
+    chance/off turnover/paint splits all come out as zero.
+    """
+    codes = lineup_df['event_code']
+    desc = lineup_df['description'].astype(str)
+
+    action = codes.map(V2_ACTION_TYPES)
+    is_fg = (action == 'fg').to_numpy()
+    is_three = desc.str.contains('3PT', regex=False).to_numpy()
+    action = np.where(is_fg & is_three, '3pt', np.where(is_fg, '2pt', action.astype(object)))
+
+    result = codes.map(V2_SHOT_RESULTS).astype(object).to_numpy()
+    is_ft = action == 'freethrow'
+    is_miss = desc.str.contains('MISS', regex=False).to_numpy()
+    result = np.where(is_ft, np.where(is_miss, 'Missed', 'Made'), result)
+
+    events = lineup_df.copy()
+    events['action_type'] = action
+    events['shot_result'] = result
+    events['subtype'] = None
+    events['qualifiers'] = [()] * len(events)
+    return events
+
+
+def has_qualifier(qualifiers, name):
+    return np.fromiter(
+        (name in q if isinstance(q, (list, tuple, str)) else False for q in qualifiers),
+        dtype=bool, count=len(qualifiers),
+    )
+
+
+def classify_events(lineup_df):
+    """
+    Classify every event of a game at once.
+
+    Returns:
+        counts: int array of shape (events, len(COUNTERS)), 1 where the event increments the counter
+    """
+    action = lineup_df['action_type'].to_numpy(dtype=object)
+    result = lineup_df['shot_result'].to_numpy(dtype=object)
+    subtype = lineup_df['subtype'].to_numpy(dtype=object)
+    has_ast = lineup_df['description'].astype(str).str.contains('AST', regex=False).to_numpy()
+    qualifiers = lineup_df['qualifiers'].to_numpy(dtype=object)
+
+    is_2pt = action == '2pt'
+    is_3pt = action == '3pt'
+    is_ft = action == 'freethrow'
+    made = result == 'Made'
+    missed = result == 'Missed'
+    made_2pt = is_2pt & made
+    made_3pt = is_3pt & made
+    is_rebound = action == 'rebound'
+
+    fastbreak = has_qualifier(qualifiers, 'fastbreak')
+    from_turnover = has_qualifier(qualifiers, 'fromturnover')
+    second_chance = has_qualifier(qualifiers, '2ndchance')
+    in_paint = has_qualifier(qualifiers, 'pointsinthepaint')
+
+    masks = {
+        'made_2pt': made_2pt,
+        'missed_2pt': is_2pt & missed,
+        'made_3pt': made_3pt,
+        'missed_3pt': is_3pt & missed,
+        'made_fts': is_ft & made,
+        'missed_fts': is_ft & missed,
+        'rebounds': is_rebound,
+        'off_rebounds': is_rebound & (subtype == 'offensive'),
+        'assists': (is_2pt | is_3pt) & has_ast,
+        'turnovers': action == 'turnover',
+        'fouls': action == 'foul',
+        'fastbreak_2': made_2pt & fastbreak,
+        'fastbreak_3': made_3pt & fastbreak,
+        'from_turnover_2': made_2pt & from_turnover,
+        'from_turnover_3': made_3pt & from_turnover,
+        'second_chance_2': made_2pt & second_chance,
+        'second_chance_3': made_3pt & second_chance,
+        'points_in_paint': made_2pt & in_paint,
+    }
+    return np.column_stack([masks[name] for name in COUNTERS]).astype(np.int64)
+
+
+def build_records(game_id, team, opponent, lineups, periods, minutes_played, us, opp, team_height, opp_height):
+    """Turn every lineup-period group of one side into S2 rows (all inputs are per-group arrays)."""
+    c = {name: i for i, name in enumerate(COUNTERS)}
+
+    # possession calculation
+    poss_calc = us[:, c['made_2pt']] + us[:, c['missed_2pt']] + us[:, c['made_3pt']] + us[:, c['missed_3pt']] \
+        - us[:, c['off_rebounds']] + us[:, c['turnovers']] + 0.44 * us[:, c['made_fts']] + us[:, c['missed_fts']]
+    opp_poss_calc = opp[:, c['made_2pt']] + opp[:, c['missed_2pt']] + opp[:, c['made_3pt']] + opp[:, c['missed_3pt']] \
+        - opp[:, c['off_rebounds']] + opp[:, c['turnovers']] + 0.44 * opp[:, c['made_fts']] + opp[:, c['missed_fts']]
+
+    columns = {
+        'team_avg_height': team_height,
+        'opp_avg_height': opp_height,
+        'minutes_played': minutes_played,
+        'period': periods,
+        'points': 2*us[:, c['made_2pt']] + 3*us[:, c['made_3pt']] + us[:, c['made_fts']],
+        'opp_points': 2*opp[:, c['made_2pt']] + 3*opp[:, c['made_3pt']] + opp[:, c['made_fts']],
+        'rebounds': us[:, c['rebounds']],
+        'opp_rebounds': opp[:, c['rebounds']],
+        'assists': us[:, c['assists']],
+        'opp_assists': opp[:, c['assists']],
+        'turnovers': us[:, c['turnovers']],
+        'opp_turnovers': opp[:, c['turnovers']],
+        'fouls_committed': us[:, c['fouls']],
+        'fouls_drawn': opp[:, c['fouls']],
+        'possessions': poss_calc,
+        'opp_possessions': opp_poss_calc,
+        'fastbreak': us[:, c['fastbreak_2']]*2 + us[:, c['fastbreak_3']]*3,
+        'from_turnover': us[:, c['from_turnover_2']]*2 + us[:, c['from_turnover_3']]*3,
+        'second_chance': us[:, c['second_chance_2']]*2 + us[:, c['second_chance_3']]*3,
+        'points_in_paint': us[:, c['points_in_paint']]*2,
+        'opp_from_turnover': opp[:, c['from_turnover_2']]*2 + opp[:, c['from_turnover_3']]*3,
+        'opp_fastbreak': opp[:, c['fastbreak_2']]*2 + opp[:, c['fastbreak_3']]*3,
+        'opp_second_chance': opp[:, c['second_chance_2']]*2 + opp[:, c['second_chance_3']]*3,
+        'opp_points_in_paint': opp[:, c['points_in_paint']]*2,
+        'unscaled_pace': poss_calc + opp_poss_calc,  # Multiple by 24/minutes_played AFTER aggregation
+    }
+    columns = {name: np.asarray(values).tolist() for name, values in columns.items()}
+
+    records = []
+    for i, lineup in enumerate(lineups):
+        record = {'game_id': game_id, 'team': team, 'opponent': opponent, 'lineup': lineup}
+        record.update({name: values[i] for name, values in columns.items()})
+        records.append(record)
+    return records
+
+
+def aggregate_side(events, counts, side, game_id, team, opponent):
+    """Grouped sums of the event counters for one side, keyed by (lineup, period)."""
+    other = 'away' if side == 'home' else 'home'
+    lineup_codes, lineups = pd.factorize(events[f'{side}_on_court'])
+    periods = events['period'].to_numpy()
+    group_ids, group_keys = pd.factorize(lineup_codes * (MAX_PERIODS + 1) + periods)
+    n_groups = len(group_keys)
+
+    team_involved = events['team_involved'].to_numpy(dtype=object)
+    is_us = team_involved == side
+    is_opp = team_involved == other
+
+    us = np.zeros((n_groups, len(COUNTERS)), dtype=np.int64)
+    opp = np.zeros((n_groups, len(COUNTERS)), dtype=np.int64)
+    np.add.at(us, group_ids[is_us], counts[is_us])
+    np.add.at(opp, group_ids[is_opp], counts[is_opp])
+    minutes_played = np.bincount(group_ids, weights=events['elapsed_time'].to_numpy(dtype=float), minlength=n_groups)
+
+    # Heights come from the group's last event
+    last = np.full(n_groups, -1)
+    np.maximum.at(last, group_ids, np.arange(len(events)))
+    team_height = events[f'avg_{side}_height'].to_numpy()[last]
+    opp_height = events[f'avg_{other}_height'].to_numpy()[last]
+
+    group_lineups = [lineups[code] for code in group_keys // (MAX_PERIODS + 1)]
+    group_periods = group_keys % (MAX_PERIODS + 1)
+
+    records = build_records(game_id, team, opponent, group_lineups, group_periods, minutes_played,
+                            us, opp, team_height, opp_height)
+    return sorted(records, key=lambda r: r['period'])
+
+
+def aggregate_lineup_periods(lineup_df, game_id, home_team, away_team, max_periods=MAX_PERIODS):
+    """
+    Build every home and away lineup-period record of a game from one classification pass.
+
+    Events are classified once into counter masks, then summed per (lineup, period)
+    for each side.
+
+    Args:
+        lineup_df: per-event lineup tracking DataFrame for the game (v3 columns; run v2
+            frames through normalize_v2_events first).
+        game_id: NBA game id.
+        home_team, away_team: team tricodes.
+        max_periods: periods after this are dropped.
+
+    Returns:
+        home_records, away_records: lists of S2 rows
+    """
+    events = lineup_df[lineup_df['period'] <= max_periods]
+    if events.empty:
+        return [], []
+    counts = classify_events(events)
+
+    home_records = aggregate_side(events, counts, 'home', game_id, home_team, away_team)
+    away_records = aggregate_side(events, counts, 'away', game_id, away_team, home_team)
+    return home_records, away_records
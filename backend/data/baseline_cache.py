@@ -0,0 +1,47 @@
+import json
+import os
+
+
+class BaselineCache:
+    """
+    Memo of a season-wide computation (e.g. report.standards_values), keyed on the data version.
+
+    The value is kept in memory and in a JSON file, so every report and API request in a
+    process shares one computation, and a restart reuses it as long as the team files are
+    unchanged. Values must be JSON serializable (tuples come back as tuples).
+
+    Args:
+        path: JSON file the last value is persisted to.
+        compute: function returning the value; only called when the version changes.
+    """
+
+    def __init__(self, path, compute):
+        self.path = path
+        self.compute = compute
+        self.version = None
+        self.value = None
+        self.computations = 0
+
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    saved = json.load(f)
+                self.version, self.value = saved['version'], tuple(saved['value'])
+            except (ValueError, KeyError):
+                print(f"[⚠️ Baseline Cache] Ignoring unreadable cache file {path}")
+
+    def get(self, version):
+        if version != self.version:
+            self.value = tuple(float(v) for v in self.compute())
+            self.version = version
+            self.computations += 1
+            self.save()
+        return self.value
+
+    def save(self):
+        # Write to a temp file and swap it in so a crash never leaves a half-written cache
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'value': list(self.value)}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,81 @@
+import numpy as np
+from edge_matrix import METRICS, metric_rates
+
+# Replicates per interval; every replicate is drawn at once as one index array
+BOOTSTRAP_SAMPLES = 2000
+
+# Central interval reported (0.9 -> 5th to 95th percentile)
+CONFIDENCE = 0.9
+
+
+def resample_totals(per_game, samples, rng):
+    """
+    Season totals of `samples` bootstrap replicates of a team's (or lineup's) games.
+
+    Args:
+        per_game: (games, columns) per-game totals.
+
+    Returns:
+        (samples, columns) totals, each from games drawn with replacement
+    """
+    n_games = len(per_game)
+    if n_games == 0:
+        return np.zeros((samples, per_game.shape[1]))
+    picks = rng.integers(0, n_games, size=(samples, n_games))
+    return per_game[picks].sum(axis=1)
+
+
+def interval(replicates, confidence=CONFIDENCE):
+    """(lower, upper) percentiles of replicates along axis 0."""
+    tail = (1 - confidence) / 2 * 100
+    return np.percentile(replicates, [tail, 100 - tail], axis=0)
+
+
+def edge_intervals(matchups, team_games, opponent_games, columns, samples=BOOTSTRAP_SAMPLES,
+                   confidence=CONFIDENCE, rng=None, metrics=METRICS):
+    """
+    Bootstrap intervals of one team's edges against an opponent, for every metric at once.
+
+    Both teams' games are resampled independently, the replicates go through the same
+    metric registry and league standardization as the point edges.
+
+    Args:
+        matchups: EdgeMatrix the point edges come from (supplies the league baselines).
+        team_games, opponent_games: (games, columns) per-game totals of each side's top lineups.
+        columns: column names of the per-game arrays.
+
+    Returns:
+        lower, upper: (metrics,) interval bounds
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    team_offense, _ = metric_rates(resample_totals(team_games, samples, rng), columns, metrics)
+    _, opponent_defense = metric_rates(resample_totals(opponent_games, samples, rng), columns, metrics)
+    edges = matchups.standardize(0.5 * (team_offense + opponent_defense))
+    return interval(edges, confidence)
+
+
+def net_rating_intervals(lineup_games, columns, samples=BOOTSTRAP_SAMPLES, confidence=CONFIDENCE, rng=None):
+    """
+    Net rating (points minus opponent points per 100 possessions) and its bootstrap interval per lineup.
+
+    Args:
+        lineup_games: list of (games, columns) per-game totals, one per lineup.
+
+    Returns:
+        list of (net_rating, lower, upper)
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    col = {name: i for i, name in enumerate(columns)}
+
+    def net(totals):
+        poss = np.where(totals[..., col['possessions']] > 0, totals[..., col['possessions']], np.nan)
+        opp_poss = np.where(totals[..., col['opp_possessions']] > 0, totals[..., col['opp_possessions']], np.nan)
+        return 100 * (totals[..., col['points']] / poss - totals[..., col['opp_points']] / opp_poss)
+
+    results = []
+    for games in lineup_games:
+        replicates = net(resample_totals(games, samples, rng))
+        replicates = replicates[~np.isnan(replicates)]
+        lower, upper = interval(replicates, confidence) if len(replicates) else (np.nan, np.nan)
+        results.append((float(net(games.sum(axis=0))), float(lower), float(upper)))
+    return results
@@ -0,0 +1,25 @@
+## BUILD THE PARQUET LINEUP STORE FROM THE TEAM CSVs
+# Converts every S1/S2 team file whose partition is missing or stale into
+# store/<season>/team=<TEAM>/part-0.parquet, and removes partitions of team files that are gone.
+# Ingestion keeps the store up to date afterwards; re-run this after a pull or after editing CSVs by hand.
+
+import os
+import shutil
+import pandas as pd
+from lineup_store import STORE, SEASON_SUFFIXES, file_stamp, team_csv_path, pa
+
+if pa is None:
+    raise SystemExit("pyarrow is not installed (pip install pyarrow), readers will keep using the CSVs")
+
+for season in SEASON_SUFFIXES:
+    for team in STORE.stale_teams(season):
+        path = team_csv_path(season, team)
+        if not os.path.exists(path):
+            shutil.rmtree(os.path.dirname(STORE.partition_path(season, team)))
+            print(f"{season} {team}: removed (no team file)")
+            continue
+        # Stamp before reading, so a write that lands mid-read leaves the partition stale
+        stamp = file_stamp(path)
+        df = pd.read_csv(path, float_precision='round_trip')
+        STORE.write_team(season, team, df, source_stamp=stamp)
+        print(f"{season} {team}: {len(df)} rows")
@@ -0,0 +1,50 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+
+def payload_hash(digests):
+    """Combine the per-endpoint payload digests of a game into one data hash."""
+    return hashlib.sha256('|'.join(digests).encode('utf-8')).hexdigest()
+
+
+class Checkpoint:
+    """
+    Manifest of ingested games: game_id -> status, data hash and last update time.
+
+    A game only counts as ingested once its rows are on disk ('done'). Anything else
+    ('failed', 'in_progress', or missing) is picked up again by the next run.
+
+    Args:
+        path: JSON file the manifest is kept in.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.games = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.games = json.load(f)
+
+    def needs_ingest(self, game_id, data_hash=None):
+        entry = self.games.get(str(game_id))
+        if entry is None or entry['status'] != 'done':
+            return True
+        # The raw payload changed since the game was parsed
+        return data_hash is not None and entry.get('hash') != data_hash
+
+    def mark(self, game_id, status, data_hash=None):
+        self.games[str(game_id)] = {
+            'status': status,
+            'hash': data_hash,
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def save(self):
+        # Write to a temp file and swap it in so a crash never corrupts the manifest
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.games, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -1,13 +1,21 @@
 from nba_api.stats.endpoints import playbyplayv2, boxscoretraditionalv2, boxscoretraditionalv3
 import pandas as pd
-from nba_api.stats.endpoints import scheduleleaguev2
 from nba_api.stats.static import teams
 import time
 import random
-import numpy as np
 import unicodedata
 import os
 from datetime import datetime
+from fetcher import fetch_games, stats_frames
+from raw_store import RawPayloadStore
+from team_files import write_team_games
+from accumulator import StintAccumulator
+from aggregate import aggregate_lineup_periods, normalize_v2_events
+from player_index import HeightIndex
+from schedule_store import ScheduleStore
+from lineup_keys import LineupRegistry
+from lineup_store import STORE as LINEUP_STORE
+from lineup_aggregates import AGGREGATES as LINEUP_AGGREGATES, file_stamp
 
 #time how long it takes to run
 time_start = time.time()
@@ -113,17 +121,15 @@ def elapsed_time(idx, row, df):
         delta_min = (t_prev - t_current).total_seconds() /60
         return delta_min
 
-# Fetch the full 2024–25 NBA schedule
-sched = scheduleleaguev2.ScheduleLeagueV2(
-    league_id='00', 
-    season='2024-25'
-)
-df = sched.get_data_frames()[0]  # 'SeasonGames' table
+# Raw payloads are cached here; OFFLINE rebuilds every S1 file from the cache with no network calls
+STORE = RawPayloadStore(os.path.join('raw', 'S1'))
+OFFLINE = False
 
-# Filter for regular season games
-df_reg = df[df['gameId'].str.startswith('0022')]
-
-game_ids = df_reg['gameId'].unique().tolist()
+if OFFLINE:
+    game_ids = STORE.game_ids('pbp_v2')
+else:
+    # The 2024–25 regular season schedule, downloaded once into the local store
+    game_ids = ScheduleStore('S1').load(download=True).game_ids()
 
 
 # Get all NBA teams
@@ -134,40 +140,59 @@ team_abbreviations = [team['abbreviation'] for team in nba_teams_data]
 
 # Fields for lineup stats
 stat_fields = [
-    'game_id', 'lineup', 'period', 'points', 'opp_points',
+    'game_id', 'team', 'opponent', 'team_avg_height', 'opp_avg_height',
+    'lineup_key', 'minutes_played', 'period', 'points', 'opp_points',
     'rebounds', 'opp_rebounds', 'assists', 'opp_assists',
     'turnovers', 'opp_turnovers', 'fouls_committed', 'fouls_drawn'
 ]
 
-# Create the dictionary
-team_lineup_stats = {
-    team: pd.DataFrame(columns=stat_fields)
-    for team in team_abbreviations
-}
+# Lineup-period records per team, turned into DataFrames once when writing
+team_lineup_stats = StintAccumulator(stat_fields)
+
+# Player name -> height in inches, with name corrections applied once here
+HEIGHTS = HeightIndex(pd.read_csv('playersBDL24.csv'))
 
-# Active player csv
-additional_data = pd.read_csv('playersBDL24.csv')
+# Player name <-> code registry behind the integer lineup_key column
+LINEUPS = LineupRegistry(os.path.join('S1', 'lineup_players.csv'))
 
 height_dict = dict()
 
 count = 0
 start=1200
 end=1200
-for idx,id in enumerate(game_ids[start:]):
+
+# Replay covers every cached game
+if OFFLINE:
+    start = 0
+
+# Number of games fetched at once; the shared rate limit scales with it
+CONCURRENCY = 4
+
+# Raw JSON payload for each endpoint, parsed after the fetch
+LOADERS = {
+    'pbp_v2': lambda gid: playbyplayv2.PlayByPlayV2(game_id=gid).get_dict(),
+    'boxscore_v3': lambda gid: boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=gid).get_dict(),
+}
+
+for idx, result in enumerate(fetch_games(game_ids[start:], LOADERS, concurrency=CONCURRENCY, store=STORE, offline=OFFLINE)):
     
     # Load game
-    game_id = id
-    for attempt in range(3):
-        try:
-            pbp_df = playbyplayv2.PlayByPlayV2(game_id=game_id).get_data_frames()[0]
-            box_df = boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=game_id).get_data_frames()[0]
-            box_df['full_name'] = box_df['firstName'] + ' ' + box_df['familyName']
-            break
-        except Exception as e:
-            print(f"Attempt {attempt + 1} failed for game {game_id}: {str(e)}")
-            time.sleep(int(np.random.choice([21, 33,42])))
-        
-        
+    game_id = result.game_id
+    if result.error is not None:
+        print(f"Skipping game {game_id}: {result.error}")
+        continue
+
+    pbp_df = stats_frames(playbyplayv2.PlayByPlayV2, result.payloads['pbp_v2'], game_id=game_id)[0]
+    box_df = stats_frames(boxscoretraditionalv3.BoxScoreTraditionalV3, result.payloads['boxscore_v3'], game_id=game_id)[0]
+    box_df['full_name'] = box_df['firstName'] + ' ' + box_df['familyName']
+    for player_name, player_id in zip(box_df['full_name'], box_df['personId']):
+        LINEUPS.code(player_name, player_id)
+
+    # The 2024-25 season is complete, so every parsed game can be cached
+    for name, payload in result.payloads.items():
+        if not STORE.has(name, game_id):
+            STORE.put(name, game_id, payload)
+
 
     # Debug.. rows are in wrong order
     if game_id == "0022400316":
@@ -184,11 +209,8 @@ for idx,id in enumerate(game_ids[start:]):
         # Optional: sort by EVENTNUM or reset index
         pbp_df = pbp_df.sort_values(by='EVENTNUM').reset_index(drop=True)
 
-    # avoid rate limits
-    if idx % 1 == 0:
-        if idx%25 == 0:
-            print(idx+start)
-        time.sleep(0.5)
+    if idx%25 == 0:
+        print(idx+start)
 
     # Build player-to-team map
     player_team_map = dict(zip(box_df['full_name'], box_df['teamTricode']))
@@ -286,39 +308,10 @@ for idx,id in enumerate(game_ids[start:]):
                 team_involved = 'home' if player_team_map[player1] == home_team else 'away'
         
 
-        # calculate average height of home and away
-        total_height = 0
-        if tuple(sorted(home_on_court)) not in height_dict:
-            for player in sorted(home_on_court):
-                first_name, last_name = player.split(' ', 1)
-                if last_name == 'Lavine':
-                    last_name = 'LaVine'
-                height = additional_data[(additional_data['first_name'] == first_name) & (additional_data['last_name'] == last_name)]['height']
-                if len(height) == 0:
-                    print(f"[⚠️ Height Error] Could not resolve height {height} for home player: {player}, {game_id}")
-                    continue
-                feet, inches = str(height.dropna().reset_index(drop=True)[0]).split('-')
-                total_height += int(feet) * 12 + int(inches)
-            avg_home_height = total_height / len(home_on_court)
-            height_dict[tuple(sorted(home_on_court))] = avg_home_height
-
-        total_height = 0
-        
-        if tuple(sorted(away_on_court)) not in height_dict:
-            for player in sorted(away_on_court):
-                first_name, last_name = player.split(' ', 1)
-                if last_name == 'Lavine':
-                    last_name = 'LaVine'
-                if first_name == 'Tobais' and last_name == 'Harris':
-                    first_name = 'Tobias'
-                height = additional_data[(additional_data['first_name'] == first_name) & (additional_data['last_name'] == last_name)]['height']
-                if len(height) == 0:
-                    print(f"[⚠️ Height Error] Could not resolve height {height} for away player: {first_name} {last_name}, {game_id}")
-                    continue
-                feet, inches = str(height.dropna().reset_index(drop=True)[0]).split('-')
-                total_height += int(feet) * 12 + int(inches)
-            avg_away_height = total_height / len(away_on_court)
-            height_dict[tuple(sorted(away_on_court))] = avg_away_height
+        # calculate average height of home and away (once per new lineup)
+        for lineup in (tuple(sorted(home_on_court)), tuple(sorted(away_on_court))):
+            if lineup not in height_dict:
+                height_dict[lineup] = HEIGHTS.lineup_average(lineup)
 
         # Log current state
         lineup_tracking.append({
@@ -341,202 +334,18 @@ for idx,id in enumerate(game_ids[start:]):
 
     lineup_df.to_csv(f'test_lineup.csv', index=False)
 
-    periods = 5
-
-    # Get list of unique lineups for home and away
-    unique_lineups_home = set(lineup_df['home_on_court'])
-    unique_lineups_away = set(lineup_df['away_on_court'])
-    count1=0
-    count2=0
-    lineup_df[(lineup_df['period'] == 2)].to_csv('test_lineup.csv', index=False)
-    for period in range(1, periods + 1):
-
-        for lineup in unique_lineups_home: 
-            new_lineup_df = lineup_df[(lineup_df['period'] == period) & (lineup_df['home_on_court'] == lineup)]
+    # Map v2 event codes onto the shared classification kernel, then aggregate every
+    # home and away lineup-period record at once (S1 keeps the first OT only)
+    home_records, away_records = aggregate_lineup_periods(normalize_v2_events(lineup_df), game_id, home_team, away_team, max_periods=5)
+    for record in home_records:
+        record['lineup_key'] = LINEUPS.encode(record.pop('lineup'))
+        team_lineup_stats.add(home_team, record)
+    for record in away_records:
+        record['lineup_key'] = LINEUPS.encode(record.pop('lineup'))
+        team_lineup_stats.add(away_team, record)
 
-            # continue if lineup is empty
-            if len(new_lineup_df) == 0:
-                continue
-                
-            # Calculate stats
-
-            made_2pt = made_fts = made_3pt = missed_2pt = missed_fts = missed_3pt = rebounds = assists = turnovers = fouls_committed = minutes_played = 0
-            opp_made_2pt = opp_made_fts = opp_made_3pt = opp_missed_2pt = opp_missed_fts = opp_missed_3pt = opp_rebounds = opp_assists = opp_turnovers = fouls_drawn = 0
-
-            for _, row in new_lineup_df.iterrows():
-                team_involved = row['team_involved']
-                is_us = team_involved == 'home'
-                if_not_us = team_involved == 'away'
-                desc = str(row['description'])
-                minutes_played += row['elapsed_time']
-                
-                if is_us:
-                    if row['event_code'] == 1 and 'AST' in desc:
-                        assists += 1
-                    if row['event_code'] == 1 and '3PT' not in desc:
-                        made_2pt += 1
-                    if row['event_code'] == 1 and '3PT' in desc:
-                        made_3pt += 1
-                    if row['event_code'] == 3 and "MISS" not in desc:
-                        made_fts += 1
-                    if row['event_code'] == 4:
-                        rebounds += 1
-                    if row['event_code'] == 5:
-                        turnovers += 1
-                    if row['event_code'] == 6:
-                        fouls_committed += 1
-                    if row['event_code'] == 2 and '3PT' not in desc:
-                        missed_2pt += 1
-                    if row['event_code'] == 2 and '3PT' in desc:
-                        missed_3pt += 1
-                    if row['event_code'] == 3 and "MISS" in desc:
-                        missed_fts += 1
-
-                elif if_not_us:
-                    if row['event_code'] == 1 and 'AST' in desc:
-                        opp_assists += 1
-                    if row['event_code'] == 1 and '3PT' not in desc:
-                        opp_made_2pt += 1
-                    if row['event_code'] == 1 and '3PT' in desc:
-                        opp_made_3pt += 1
-                    if row['event_code'] == 3 and "MISS" not in desc:
-                        opp_made_fts += 1
-                    if row['event_code'] == 4:
-                        # print(count1, desc)
-                        # count1 += 1
-                        opp_rebounds += 1
-                    if row['event_code'] == 5:
-                        opp_turnovers += 1
-                    if row['event_code'] == 6:
-                        fouls_drawn += 1
-                    if row['event_code'] == 2 and '3PT' not in desc:
-                        opp_missed_2pt += 1
-                    if row['event_code'] == 2 and '3PT' in desc:
-                        opp_missed_3pt += 1
-                    if row['event_code'] == 3 and "MISS" in desc:
-                        opp_missed_fts += 1
-
-            record = {
-                'game_id': game_id,
-                'team': home_team,
-                'opponent': away_team,
-                'team_avg_height': row['avg_home_height'],
-                'opp_avg_height': row['avg_away_height'],
-                'lineup': lineup,
-                'minutes_played': minutes_played,
-                'period': period,
-                'points': 2*made_2pt + 3*made_3pt + made_fts,
-                'opp_points': 2*opp_made_2pt + 3*opp_made_3pt + opp_made_fts,
-                'rebounds': rebounds,
-                'opp_rebounds': opp_rebounds,
-                'assists': assists,
-                'opp_assists': opp_assists,
-                'turnovers': turnovers,
-                'opp_turnovers': opp_turnovers,
-                'fouls_committed': fouls_committed,
-                'fouls_drawn': fouls_drawn
-            }
-
-
-            team_lineup_stats[home_team] = pd.concat(
-                [team_lineup_stats[home_team], pd.DataFrame([record])],
-                ignore_index=True
-            )
-
-        for lineup in unique_lineups_away: 
-            new_lineup_df = lineup_df[(lineup_df['period'] == period) & (lineup_df['away_on_court'] == lineup)]
-
-
-            # continue if lineup is empty
-            if len(new_lineup_df) == 0:
-                continue
+HEIGHTS.report_unresolved()
 
-            # Calculate stats
-
-            made_2pt = made_fts = made_3pt = missed_2pt = missed_fts = missed_3pt = rebounds = assists = turnovers = fouls_committed = minutes_played = 0
-            opp_made_2pt = opp_made_fts = opp_made_3pt = opp_missed_2pt = opp_missed_fts = opp_missed_3pt = opp_rebounds = opp_assists = opp_turnovers = fouls_drawn = 0
-            
-            for _, row in new_lineup_df.iterrows():
-                team_involved = row['team_involved']
-                is_us = team_involved == 'away'
-                if_not_us = team_involved == 'home'
-                desc = str(row['description'])
-                minutes_played += row['elapsed_time']
-
-                if is_us:
-                    if row['event_code'] == 1 and 'AST' in desc:
-                        assists += 1
-                    if row['event_code'] == 1 and '3PT' not in desc:
-                        made_2pt += 1
-                    if row['event_code'] == 1 and '3PT' in desc:
-                        made_3pt += 1
-                    if row['event_code'] == 3 and "MISS" not in desc:
-                        made_fts += 1
-                    if row['event_code'] == 4:
-                        # print(count2, desc)
-                        # count2 += 1
-                        rebounds += 1
-                    if row['event_code'] == 5:
-                        turnovers += 1
-                    if row['event_code'] == 6:
-                        fouls_committed += 1
-                    if row['event_code'] == 2 and '3PT' not in desc:
-                        missed_2pt += 1
-                    if row['event_code'] == 2 and '3PT' in desc:
-                        missed_3pt += 1
-                    if row['event_code'] == 3 and "MISS" in desc:
-                        missed_fts += 1
-                elif if_not_us:
-                    if row['event_code'] == 1 and 'AST' in desc:
-                        opp_assists += 1
-                    if row['event_code'] == 1 and '3PT' not in desc:
-                        opp_made_2pt += 1
-                    if row['event_code'] == 1 and '3PT' in desc:
-                        opp_made_3pt += 1
-                    if row['event_code'] == 3 and "MISS" not in desc:
-                        opp_made_fts += 1
-                    if row['event_code'] == 4:
-                        
-                        opp_rebounds += 1
-                    if row['event_code'] == 5:
-                        opp_turnovers += 1
-                    if row['event_code'] == 6:
-                        fouls_drawn += 1
-                    if row['event_code'] == 2 and '3PT' not in desc:
-                        opp_missed_2pt += 1
-                    if row['event_code'] == 2 and '3PT' in desc:
-                        opp_missed_3pt += 1
-                    if row['event_code'] == 3 and "MISS" in desc:
-                        opp_missed_fts += 1
-
-
-            record = {
-                'game_id': game_id,
-                'team': away_team,
-                'opponent': home_team,
-                'team_avg_height': row['avg_away_height'],
-                'opp_avg_height': row['avg_home_height'],
-                'lineup': lineup,
-                'minutes_played': minutes_played,
-                'period': period,
-                'points': 2*made_2pt + 3*made_3pt + made_fts,
-                'opp_points': 2*opp_made_2pt + 3*opp_made_3pt + opp_made_fts,
-                'rebounds': rebounds,
-                'opp_rebounds': opp_rebounds,
-                'assists': assists,
-                'opp_assists': opp_assists,
-                'turnovers': turnovers,
-                'opp_turnovers': opp_turnovers,
-                'fouls_committed': fouls_committed,
-                'fouls_drawn': fouls_drawn
-            }
-
-
-            team_lineup_stats[away_team] = pd.concat(
-                [team_lineup_stats[away_team], pd.DataFrame([record])],
-                ignore_index=True
-            )
-    
 time_end = time.time()
 time_total = time_end - time_start
 print(f"Time taken: {time_total}")
@@ -551,7 +360,7 @@ columns = [
     'opponent',
     'team_avg_height',
     'opp_avg_height',
-    'lineup',
+    'lineup_key',
     'minutes_played',
     'period',
     'points',
@@ -579,21 +388,14 @@ for abbrev in team_abbrevs:
     if not os.path.exists(file_path):
         pd.DataFrame(columns=columns).to_csv(file_path, index=False)
 
-# Append or write team data
-for team in team_lineup_stats.keys():
-    df = team_lineup_stats[team]
-    # Reorder columns explicitly before writing
-    df = df[columns]
+# Write team data, replacing rows for games already in the file so re-runs never duplicate.
+# The registry goes first so every key in the team files can be decoded.
+LINEUPS.save()
+team_lineup_stats.report()
+for team, df in team_lineup_stats.drain().items():
     csv_path = os.path.join(save_dir, f"S1_{team}_2024_25.csv")
-
-    # If file exists, append without header
-    if os.path.exists(csv_path):
-        df.to_csv(csv_path, mode='a', header=False, index=False)
-    else:
-        # First batch — write with header
-        df.to_csv(csv_path, index=False)
-
-
-
-
-
+    base_stamp = file_stamp(csv_path)
+    team_df, replaced = write_team_games(csv_path, df, columns)
+    LINEUP_STORE.write_team('S1', team, team_df)
+    LINEUP_AGGREGATES.update('S1', team, replaced, df, base_stamp)
+LINEUP_STORE.mark_ingested('S1')
@@ -1,34 +1,34 @@
 from nba_api.stats.endpoints import boxscoretraditionalv3 
 from nba_api.live.nba.endpoints import playbyplay
 import pandas as pd
-from nba_api.stats.endpoints import scheduleleaguev2
-from nba_api.stats.static import teams, players
+from nba_api.stats.static import teams
 import time
 import random
-import numpy as np
 import unicodedata
 import os
 from datetime import datetime
 import ast
+from fetcher import fetch_games, stats_frames, GameNotPlayedError
+from raw_store import RawPayloadStore
+from checkpoint import Checkpoint, payload_hash
+from team_files import write_team_games
+from accumulator import StintAccumulator
+from aggregate import aggregate_lineup_periods
+from player_index import PlayerIndex
+from schedule_store import SCHEDULE
+from lineup_keys import LineupRegistry
+from lineup_store import STORE as LINEUP_STORE
+from lineup_aggregates import AGGREGATES as LINEUP_AGGREGATES, file_stamp
 
 #time how long it takes to run
 time_start = time.time()
 
-# Active player csv
-additional_data = pd.read_csv('playersBDL25.csv')
-api_data = pd.read_csv('active25.csv')
-PLAYER_LOOKUP = {p["id"]: p["full_name"] for p in players.get_players()}
+# player_id -> name/team/position/height, built once (falls back to nba_api static players)
+PLAYERS = PlayerIndex.from_files('active25.csv', 'playersBDL25.csv')
+HEIGHTS = PLAYERS.height_index
 
 def idToName(id):
-    try:
-        name = api_data[api_data['player_id'] == id]['first_name'].values[0] + ' ' + api_data[api_data['player_id'] == id]['last_name'].values[0]
-    except:
-        try:
-            name = PLAYER_LOOKUP.get(id)
-        except:
-            name = "none"
-            print("player id not found: " + str(id))
-    return name
+    return PLAYERS.name(id)
 
 def infer_lineup_for_team(pbp_df, team_side):
     """
@@ -85,18 +85,15 @@ def safe_literal_eval(x):
             return x  # or return None, depending on what you want
     return x
 
-# Fetch the full 2024–25 NBA schedule
-sched = scheduleleaguev2.ScheduleLeagueV2(
-    league_id='00', 
-    season='2025-26'
-)
-df = sched.get_data_frames()[0]  # 'SeasonGames' table
-
-# Filter for regular season games
-df_reg = df[df['gameId'].str.startswith('0022')]
+# Raw payloads are cached here; OFFLINE rebuilds every S2 file from the cache with no network calls
+STORE = RawPayloadStore(os.path.join('raw', 'S2'))
+OFFLINE = False
 
-
-game_ids = df_reg['gameId'].unique().tolist()
+if OFFLINE:
+    game_ids = STORE.game_ids('live_pbp')
+else:
+    # Regular season schedule from the local store, re-downloaded at most once a day
+    game_ids = SCHEDULE.load(max_age_hours=24, download=True).game_ids()
 
 # Get all NBA teams
 nba_teams_data = teams.get_teams()
@@ -104,49 +101,139 @@ nba_teams_data = teams.get_teams()
 # Extract abbreviations
 team_abbreviations = [team['abbreviation'] for team in nba_teams_data]
 
-# Fields for lineup stats
-stat_fields = [
-    'game_id', 'lineup', 'period', 'points', 'opp_points',
-    'rebounds', 'opp_rebounds', 'assists', 'opp_assists',
-    'turnovers', 'opp_turnovers', 'fouls_committed', 'fouls_drawn'
-]
 
-# Create the dictionary
-team_lineup_stats = {
-    team: pd.DataFrame(columns=stat_fields)
-    for team in team_abbreviations
+height_dict = dict()
+test = False
+
+# Number of games fetched at once; the shared rate limit scales with it
+CONCURRENCY = 4
+
+# Games written to the team files (and checkpointed) together
+BATCH_SIZE = 50
+
+# Raw JSON payload for each endpoint, parsed after the fetch
+LOADERS = {
+    'live_pbp': lambda gid: playbyplay.PlayByPlay(game_id=gid).get_dict(),
+    'boxscore_v3': lambda gid: boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=gid).get_dict(),
 }
 
+# Games already ingested (and unchanged in the raw store) are skipped entirely
+CHECKPOINT = Checkpoint(os.path.join('S2', 'checkpoint.json'))
 
-height_dict = dict()
-test = False
-start= 125
-end= 250
-for idx,id in enumerate(game_ids[start:end]):
-    # Load game
-    game_id = id
-    for attempt in range(3):
-        try:
-            double_break = False
-            pbp_df = pd.DataFrame(playbyplay.PlayByPlay(game_id=game_id).get_dict()["game"]["actions"])
-            box_df = boxscoretraditionalv3.BoxScoreTraditionalV3(game_id=game_id).get_data_frames()[0]
+def cached_hash(game_id):
+    digests = [STORE.digest(name, game_id) for name in LOADERS]
+    return None if None in digests else payload_hash(digests)
 
-            # Add full name column to box_df
-            box_df['full_name'] = box_df['firstName'] + ' ' + box_df['familyName']
-            break
-        except Exception as e:
-            if "'NoneType' object has no attribute 'keys'" in str(e) or "Expecting value" in str(e):
-                print(f"Game {game_id} not played yet: {str(e)}. Further games likely not played either. Last played game is {idx + start - 1}")
-                double_break = True
-                break  
-            elif "columns passed" in str(e):
-                print("game in progress, wait till it finishes")
-            else:
-                print(f"Attempt {attempt + 1} failed for game {game_id}: {str(e)}")
-                time.sleep(int(np.random.choice([21, 33,42])))
-    if double_break:
+# Replay re-parses every cached game
+pending_ids = [g for g in game_ids if OFFLINE or CHECKPOINT.needs_ingest(g, cached_hash(g))]
+print(f"{len(pending_ids)} of {len(game_ids)} games to ingest")
+
+columns = [
+    'game_id',
+    'team',
+    'opponent',
+    'team_avg_height',
+    'opp_avg_height',
+    'lineup_key',
+    'minutes_played',
+    'period',
+    'points',
+    'opp_points',
+    'rebounds',
+    'opp_rebounds',
+    'assists',
+    'opp_assists',
+    'turnovers',
+    'opp_turnovers',
+    'fouls_committed',
+    'fouls_drawn',
+    'possessions',
+    'opp_possessions',
+    'fastbreak',
+    'from_turnover',
+    'second_chance',
+    'points_in_paint',
+    'opp_from_turnover',
+    'opp_fastbreak',
+    'opp_second_chance',
+    'opp_points_in_paint',
+    'unscaled_pace'
+]
+
+# Lineup-period records for the current batch, per team
+team_lineup_stats = StintAccumulator(columns)
+
+# Player name <-> code registry behind the integer lineup_key column
+LINEUPS = LineupRegistry(os.path.join('S2', 'lineup_players.csv'))
+
+# Define the subfolder where you want to save files
+save_dir = os.path.join("S2")
+
+# Create the folder if it doesn’t exist
+os.makedirs(save_dir, exist_ok=True)
+
+# Create empty files if they don’t exist
+for abbrev in team_abbreviations:
+    filename = f"S2_{abbrev}_2025_26.csv"
+    file_path = os.path.join(save_dir, filename)
+    if not os.path.exists(file_path) and not test:
+        pd.DataFrame(columns=columns + ['game_number']).to_csv(file_path, index=False)
+
+batch_games = []
+
+def flush_batch():
+    """Write the batch's rows into the team files, then checkpoint its games as done."""
+    if test or not batch_games:
+        return
+    # Registry goes first so every key in the team files can be decoded
+    LINEUPS.save()
+    for team, df in team_lineup_stats.drain().items():
+        # Replaces any rows already there for these games, so re-runs never duplicate
+        csv_path = os.path.join(save_dir, f"S2_{team}_2025_26.csv")
+        base_stamp = file_stamp(csv_path)
+        team_df, replaced = write_team_games(csv_path, df, columns)
+        LINEUP_STORE.write_team('S2', team, team_df)
+        LINEUP_AGGREGATES.update('S2', team, replaced, df, base_stamp)
+    # The API server picks up the batch once every team file is written
+    LINEUP_STORE.mark_ingested('S2')
+    team_lineup_stats.report()
+
+    for gid in batch_games:
+        # Only final (cached) games are done; anything else is re-read next run
+        data_hash = cached_hash(gid)
+        CHECKPOINT.mark(gid, 'done' if data_hash else 'in_progress', data_hash)
+    CHECKPOINT.save()
+    batch_games.clear()
+
+for idx, result in enumerate(fetch_games(pending_ids, LOADERS, concurrency=CONCURRENCY, store=STORE, offline=OFFLINE)):
+    # Load game
+    game_id = result.game_id
+    if isinstance(result.error, GameNotPlayedError):
+        print(f"{result.error}. Further games likely not played either.")
         break
+    elif result.error is not None:
+        print(f"Skipping game {game_id}: {result.error}")
+        CHECKPOINT.mark(game_id, 'failed')
+        continue
+
+    try:
+        pbp_df = pd.DataFrame(result.payloads['live_pbp']["game"]["actions"])
+        box_df = stats_frames(boxscoretraditionalv3.BoxScoreTraditionalV3, result.payloads['boxscore_v3'], game_id=game_id)[0]
+
+        # Add full name column to box_df
+        box_df['full_name'] = box_df['firstName'] + ' ' + box_df['familyName']
+    except Exception as e:
+        if "columns passed" in str(e):
+            print(f"Game {game_id} in progress, wait till it finishes")
+            CHECKPOINT.mark(game_id, 'in_progress')
+            continue
+        raise
 
+    # Completed games never change, so cache their payloads for future runs
+    if any(a.get('actionType') == 'game' and a.get('subType') == 'end' for a in result.payloads['live_pbp']["game"]["actions"]):
+        for name, payload in result.payloads.items():
+            if not STORE.has(name, game_id):
+                STORE.put(name, game_id, payload)
 
     # # Apply the function to the 'qualifiers' column
     # pbp_df['qualifiers'] = pbp_df['qualifiers'].apply(safe_literal_eval)
@@ -155,11 +242,14 @@ for idx,id in enumerate(game_ids[start:end]):
         pbp_df.to_csv('test_pbp.csv', index=False)
 
 
-    # avoid rate limits
-    if idx % 1 == 0:
-        if idx%25 == 0:
-            print(idx+start)
-        time.sleep(0.5)
+    if idx%25 == 0:
+        print(idx)
+
+    # Register this game's players with their ids (same spelling as the play-by-play)
+    for player_id in box_df['personId']:
+        player_name = idToName(player_id)
+        if player_name is not None:
+            LINEUPS.code(player_name, player_id)
 
     # Build player-to-team map
     player_team_map = dict(zip(box_df['full_name'], box_df['teamTricode']))
@@ -175,6 +265,7 @@ for idx,id in enumerate(game_ids[start:end]):
     except:
         print(f"[⚠️ Warning : {game_id}] Could not resolve teams, {game_id}")
         # print(teams)
+        CHECKPOINT.mark(game_id, 'failed')
         continue
 
     # Get starters
@@ -198,7 +289,7 @@ for idx,id in enumerate(game_ids[start:end]):
         event_desc = row['description']
         player_id = row['personId']
         player_name = idToName(player_id)
-        if player_name == "none":
+        if player_name is None:
             print(row)        
         team_involved = 'home' if row['teamTricode'] == home_team else 'away'
                 
@@ -233,51 +324,10 @@ for idx,id in enumerate(game_ids[start:end]):
 
         
 
-        # calculate average height of home and away
-        total_height = 0
-        if tuple(sorted(home_on_court)) not in height_dict:
-            for player in sorted(home_on_court):
-                first_name, last_name = player.split(' ', 1)
-                
-                # Debugging... fix player name (poor fix, improve later)
-                if first_name == 'Yanic':
-                    first_name = "Yanic Konan"
-                    last_name = "Niederhäuser"
-                if last_name == 'Lavine':
-                    last_name = 'LaVine' # capitalize the V
-
-                height = additional_data[(additional_data['first_name'] == first_name) & (additional_data['last_name'] == last_name)]['height']
-                if len(height) == 0:
-                    print(f"[⚠️ Height Error] Could not resolve height {height} for home player: {first_name} (first) {last_name} (last), {game_id}")
-                    continue
-                feet, inches = str(height.dropna().reset_index(drop=True)[0]).split('-')
-                total_height += int(feet) * 12 + int(inches)
-            avg_home_height = total_height / len(home_on_court)
-            height_dict[tuple(sorted(home_on_court))] = avg_home_height
-
-        total_height = 0
-        
-        if tuple(sorted(away_on_court)) not in height_dict:
-            for player in sorted(away_on_court):
-                first_name, last_name = player.split(' ', 1)
-                
-                # Debugging... fix player name (poor fix, improve later)
-                if first_name == 'Yanic':
-                    first_name = "Yanic Konan"
-                    last_name = "Niederhäuser"
-                if last_name == 'Lavine':
-                    last_name = 'LaVine'
-                if first_name == 'Tobais' and last_name == 'Harris':
-                    first_name = 'Tobias'
-
-                height = additional_data[(additional_data['first_name'] == first_name) & (additional_data['last_name'] == last_name)]['height']
-                if len(height) == 0:
-                    print(f"[⚠️ Height Error] Could not resolve height {height} for away player: {first_name} (first) {last_name} (last), {game_id}")
-                    continue
-                feet, inches = str(height.dropna().reset_index(drop=True)[0]).split('-')
-                total_height += int(feet) * 12 + int(inches)
-            avg_away_height = total_height / len(away_on_court)
-            height_dict[tuple(sorted(away_on_court))] = avg_away_height
+        # calculate average height of home and away (once per new lineup)
+        for lineup in (tuple(sorted(home_on_court)), tuple(sorted(away_on_court))):
+            if lineup not in height_dict:
+                height_dict[lineup] = HEIGHTS.lineup_average(lineup)
 
         # Log current state
         lineup_tracking.append({
@@ -305,394 +355,29 @@ for idx,id in enumerate(game_ids[start:end]):
     if test:
         lineup_df.to_csv(f'test_lineup.csv', index=False)
 
-    periods = 8
+    # Every home and away lineup-period record in one pass over the events
+    home_records, away_records = aggregate_lineup_periods(lineup_df, game_id, home_team, away_team)
+    for record in home_records:
+        record['lineup_key'] = LINEUPS.encode(record.pop('lineup'))
+        team_lineup_stats.add(home_team, record)
+    for record in away_records:
+        record['lineup_key'] = LINEUPS.encode(record.pop('lineup'))
+        team_lineup_stats.add(away_team, record)
 
-    # Get list of unique lineups for home and away
-    unique_lineups_home = set(lineup_df['home_on_court'])
-    unique_lineups_away = set(lineup_df['away_on_court'])
+    batch_games.append(game_id)
+    if len(batch_games) >= BATCH_SIZE or team_lineup_stats.full():
+        flush_batch()
 
-    for period in range(1, periods + 1):
+flush_batch()
 
-        for lineup in unique_lineups_home: 
-            new_lineup_df = lineup_df[(lineup_df['period'] == period) & (lineup_df['home_on_court'] == lineup)]
+PLAYERS.report_misses()
+HEIGHTS.report_unresolved()
 
-            # continue if lineup is empty
-            if new_lineup_df.empty:
-                continue
-                
-            # Calculate stats
-
-            made_2pt = made_fts = made_3pt = missed_2pt = missed_fts = missed_3pt = rebounds = assists \
-            = turnovers = fouls_committed = minutes_played = off_rebounds = fastbreak_2 = from_turnover_2 = second_chance_2 \
-            = fastbreak_3 = from_turnover_3 = second_chance_3 = points_in_paint = opp_made_2pt = opp_made_fts = opp_made_3pt \
-            = opp_missed_2pt = opp_missed_fts = opp_missed_3pt = opp_rebounds = opp_assists = opp_turnovers = fouls_drawn \
-            = opp_off_rebounds = opp_fastbreak_2 = opp_from_turnover_2 = opp_second_chance_2 = opp_fastbreak_3 = \
-            opp_from_turnover_3 = opp_second_chance_3 = opp_points_in_paint = 0
-
-            for _, row in new_lineup_df.iterrows():
-                team_involved = row['team_involved']
-                is_us = team_involved == 'home'
-                if_not_us = team_involved == 'away'
-                desc = str(row['description'])
-                action = row['action_type']
-                minutes_played += row['elapsed_time']
-                result = row['shot_result']
-                subtype = row['subtype']
-
-                # # convert string to actual list
-                # try:
-                #     row['qualifiers'] = ast.literal_eval(row['qualifiers'])
-                # except:
-                #     pass
-                qualifiers = row['qualifiers']
-
-                if is_us:
-                    if action in ['2pt', '3pt'] and 'AST' in desc:
-                        assists += 1
-                    if action == '2pt' and result == 'Made':
-                        made_2pt += 1
-                        if 'fastbreak' in qualifiers:
-                            fastbreak_2 += 1
-                        if 'fromturnover' in qualifiers:
-                            from_turnover_2 += 1
-                        if '2ndchance' in qualifiers:
-                            second_chance_2 += 1
-                        if 'pointsinthepaint' in qualifiers:
-                            points_in_paint += 1
-                    if action == '3pt' and result == 'Made':
-                        made_3pt += 1
-                        if 'fastbreak' in qualifiers:
-                            fastbreak_3 += 1
-                        if 'fromturnover' in qualifiers:
-                            from_turnover_3 += 1
-                        if '2ndchance' in qualifiers:
-                            second_chance_3 += 1
-                    if action == 'freethrow' and result == 'Made':
-                        made_fts += 1
-                    if action == 'rebound':
-                        rebounds += 1
-                    if action == 'turnover':
-                        turnovers += 1
-                    if action == 'foul':
-                        fouls_committed += 1
-                    if action == '2pt' and result == 'Missed':
-                        missed_2pt += 1
-                    if action == '3pt' and result == 'Missed':
-                        missed_3pt += 1
-                    if action == 'freethrow' and result == 'Missed':
-                        missed_fts += 1
-                    if action == 'rebound' and subtype == 'offensive':
-                        off_rebounds += 1                   
-
-                elif if_not_us:
-                    if action in ['2pt', '3pt'] and 'AST' in desc:
-                        opp_assists += 1
-                    if action == '2pt' and result == 'Made':
-                        opp_made_2pt += 1
-                        if 'fastbreak' in qualifiers:
-                            opp_fastbreak_2 += 1
-                        if 'fromturnover' in qualifiers:
-                            opp_from_turnover_2 += 1
-                        if '2ndchance' in qualifiers:
-                            opp_second_chance_2 += 1
-                        if 'pointsinthepaint' in qualifiers:
-                            opp_points_in_paint += 1
-                    if action == '3pt' and result == 'Made':
-                        opp_made_3pt += 1
-                        if 'fastbreak' in qualifiers:
-                            opp_fastbreak_3 += 1
-                        if 'fromturnover' in qualifiers:
-                            opp_from_turnover_3 += 1
-                        if '2ndchance' in qualifiers:
-                            opp_second_chance_3 += 1
-                    if action == 'freethrow' and result == 'Made':
-                        opp_made_fts += 1
-                    if action == 'rebound':
-                        opp_rebounds += 1
-                    if action == 'turnover':
-                        opp_turnovers += 1
-                    if action == 'foul':
-                        fouls_drawn += 1
-                    if action == '2pt' and result == 'Missed':
-                        opp_missed_2pt += 1
-                    if action == '3pt' and result == 'Missed':
-                        opp_missed_3pt += 1
-                    if action == 'freethrow' and result == 'Missed':
-                        opp_missed_fts += 1
-                    if action == 'rebound' and subtype == 'offensive':
-                        opp_off_rebounds += 1
-
-            # possession calculation
-            poss_calc = made_2pt + missed_2pt + made_3pt + missed_3pt - off_rebounds + turnovers + 0.44 * made_fts + missed_fts
-            opp_poss_calc = opp_made_2pt + opp_missed_2pt + opp_made_3pt + opp_missed_3pt - opp_off_rebounds + opp_turnovers + 0.44 * opp_made_fts + opp_missed_fts
-
-            record = {
-                'game_id': game_id,
-                'team': home_team,
-                'opponent': away_team,
-                'team_avg_height': row['avg_home_height'],
-                'opp_avg_height': row['avg_away_height'],
-                'lineup': lineup,
-                'minutes_played': minutes_played,
-                'period': period,
-                'points': 2*made_2pt + 3*made_3pt + made_fts,
-                'opp_points': 2*opp_made_2pt + 3*opp_made_3pt + opp_made_fts,
-                'rebounds': rebounds,
-                'opp_rebounds': opp_rebounds,
-                'assists': assists,
-                'opp_assists': opp_assists,
-                'turnovers': turnovers,
-                'opp_turnovers': opp_turnovers,
-                'fouls_committed': fouls_committed,
-                'fouls_drawn': fouls_drawn,
-                'possessions': poss_calc,
-                'opp_possessions': opp_poss_calc,
-                'fastbreak' : fastbreak_2*2 + fastbreak_3 *3,
-                'from_turnover' : from_turnover_2*2 + from_turnover_3*3,
-                'second_chance' : second_chance_2*2 + second_chance_3*3,
-                'points_in_paint' : points_in_paint*2,
-                'opp_from_turnover': opp_from_turnover_2*2 + opp_from_turnover_3*3,
-                'opp_fastbreak': opp_fastbreak_2*2 + opp_fastbreak_3*3,
-                'opp_second_chance': opp_second_chance_2*2 + opp_second_chance_3*3,
-                'opp_points_in_paint': opp_points_in_paint*2,
-                'unscaled_pace': poss_calc + opp_poss_calc# Multiple by 24/minutes_played AFTER aggregation
-    
-            
-            }
-
-
-            team_lineup_stats[home_team] = pd.concat(
-                [team_lineup_stats[home_team], pd.DataFrame([record])],
-                ignore_index=True
-            )
-
-        for lineup in unique_lineups_away: 
-            new_lineup_df = lineup_df[(lineup_df['period'] == period) & (lineup_df['away_on_court'] == lineup)]
-
-
-            # continue if lineup is empty
-            if new_lineup_df.empty:
-                continue
-            
-            # Calculate stats
-
-            made_2pt = made_fts = made_3pt = missed_2pt = missed_fts = missed_3pt = rebounds = assists \
-            = turnovers = fouls_committed = minutes_played = off_rebounds = fastbreak_2 = from_turnover_2 = second_chance_2 \
-            = fastbreak_3 = from_turnover_3 = second_chance_3 = points_in_paint = opp_made_2pt = opp_made_fts = opp_made_3pt \
-            = opp_missed_2pt = opp_missed_fts = opp_missed_3pt = opp_rebounds = opp_assists = opp_turnovers = fouls_drawn \
-            = opp_off_rebounds = opp_fastbreak_2 = opp_from_turnover_2 = opp_second_chance_2 = opp_fastbreak_3 = \
-            opp_from_turnover_3 = opp_second_chance_3 = opp_points_in_paint = 0
-
-
-            for i, row in new_lineup_df.iterrows():
-                team_involved = row['team_involved']
-                is_us = team_involved == 'away'
-                if_not_us = team_involved == 'home'
-                desc = str(row['description'])
-                action = row['action_type']
-                minutes_played += row['elapsed_time']
-                result = row['shot_result']
-                subtype = row['subtype']
-
-                # # convert string to actual list
-                # try:
-                #     row['qualifiers'] = ast.literal_eval(row['qualifiers'])
-                # except:
-                #     pass
-                qualifiers = row['qualifiers']
-
-                if is_us:
-                    if action in ['2pt', '3pt'] and 'AST' in desc:
-                        assists += 1
-                    if action == '2pt' and result == 'Made':
-                        made_2pt += 1
-                        if 'fastbreak' in qualifiers:
-                            fastbreak_2 += 1
-                        if 'fromturnover' in qualifiers:
-                            from_turnover_2 += 1
-                        if '2ndchance' in qualifiers:
-                            second_chance_2 += 1
-                        if 'pointsinthepaint' in qualifiers:
-                            points_in_paint += 1
-                    if action == '3pt' and result == 'Made':
-                        made_3pt += 1
-                        if 'fastbreak' in qualifiers:
-                            fastbreak_3 += 1
-                        if 'fromturnover' in qualifiers:
-                            from_turnover_3 += 1
-                        if '2ndchance' in qualifiers:
-                            second_chance_3 += 1
-                    if action == 'freethrow' and result == 'Made':
-                        made_fts += 1
-                    if action == 'rebound':
-                        rebounds += 1
-                    if action == 'turnover':
-                        turnovers += 1
-                    if action == 'foul':
-                        fouls_committed += 1
-                    if action == '2pt' and result == 'Missed':
-                        missed_2pt += 1
-                    if action == '3pt' and result == 'Missed':
-                        missed_3pt += 1
-                    if action == 'freethrow' and result == 'Missed':
-                        missed_fts += 1
-                    if action == 'rebound' and subtype == 'offensive':
-                        off_rebounds += 1                   
-
-                elif if_not_us:
-                    if action in ['2pt', '3pt'] and 'AST' in desc:
-                        opp_assists += 1
-                    if action == '2pt' and result == 'Made':
-                        opp_made_2pt += 1
-                        if 'fastbreak' in qualifiers:
-                            opp_fastbreak_2 += 1
-                        if 'fromturnover' in qualifiers:
-                            opp_from_turnover_2 += 1
-                        if '2ndchance' in qualifiers:
-                            opp_second_chance_2 += 1
-                        if 'pointsinthepaint' in qualifiers:
-                            opp_points_in_paint += 1
-                    if action == '3pt' and result == 'Made':
-                        opp_made_3pt += 1
-                        if 'fastbreak' in qualifiers:
-                            opp_fastbreak_3 += 1
-                        if 'fromturnover' in qualifiers:
-                            opp_from_turnover_3 += 1
-                        if '2ndchance' in qualifiers:
-                            opp_second_chance_3 += 1
-                    if action == 'freethrow' and result == 'Made':
-                        opp_made_fts += 1
-                    if action == 'rebound':
-                        opp_rebounds += 1
-                    if action == 'turnover':
-                        opp_turnovers += 1
-                    if action == 'foul':
-                        fouls_drawn += 1
-                    if action == '2pt' and result == 'Missed':
-                        opp_missed_2pt += 1
-                    if action == '3pt' and result == 'Missed':
-                        opp_missed_3pt += 1
-                    if action == 'freethrow' and result == 'Missed':
-                        opp_missed_fts += 1
-                    if action == 'rebound' and subtype == 'offensive':
-                        opp_off_rebounds += 1
-
-            # possession calculation
-            poss_calc = made_2pt + missed_2pt + made_3pt + missed_3pt - off_rebounds + turnovers + 0.44 * made_fts + missed_fts
-            opp_poss_calc = opp_made_2pt + opp_missed_2pt + opp_made_3pt + opp_missed_3pt - opp_off_rebounds + opp_turnovers + 0.44 * opp_made_fts + opp_missed_fts
-
-            record = {
-                'game_id': game_id,
-                'team': away_team,
-                'opponent': home_team,
-                'team_avg_height': row['avg_away_height'],
-                'opp_avg_height': row['avg_home_height'],
-                'lineup': lineup,
-                'minutes_played': minutes_played,
-                'period': period,
-                'points': 2*made_2pt + 3*made_3pt + made_fts,
-                'opp_points': 2*opp_made_2pt + 3*opp_made_3pt + opp_made_fts,
-                'rebounds': rebounds,
-                'opp_rebounds': opp_rebounds,
-                'assists': assists,
-                'opp_assists': opp_assists,
-                'turnovers': turnovers,
-                'opp_turnovers': opp_turnovers,
-                'fouls_committed': fouls_committed,
-                'fouls_drawn': fouls_drawn,
-                'possessions': poss_calc,
-                'opp_possessions': opp_poss_calc,
-                'fastbreak' : fastbreak_2*2 + fastbreak_3 *3,
-                'from_turnover' : from_turnover_2*2 + from_turnover_3*3,
-                'second_chance' : second_chance_2*2 + second_chance_3*3,
-                'points_in_paint' : points_in_paint*2,
-                'opp_from_turnover': opp_from_turnover_2*2 + opp_from_turnover_3*3,
-                'opp_fastbreak': opp_fastbreak_2*2 + opp_fastbreak_3*3,
-                'opp_second_chance': opp_second_chance_2*2 + opp_second_chance_3*3,
-                'opp_points_in_paint': opp_points_in_paint*2,
-                'unscaled_pace': poss_calc + opp_poss_calc# Multiple by 24/minutes_played AFTER aggregation
-            
-            }
-
-            team_lineup_stats[away_team] = pd.concat(
-                [team_lineup_stats[away_team], pd.DataFrame([record])],
-                ignore_index=True
-            )
-    
 time_end = time.time()
 time_total = time_end - time_start
 print(f"Time taken: {time_total}")
 
-
-# Create empty CSV files for each team
-team_abbrevs = [team['abbreviation'] for team in teams.get_teams()]
-
-columns = [
-    'game_id',
-    'team',
-    'opponent',
-    'team_avg_height',
-    'opp_avg_height',
-    'lineup',
-    'minutes_played',
-    'period',
-    'points',
-    'opp_points',
-    'rebounds',
-    'opp_rebounds',
-    'assists',
-    'opp_assists',
-    'turnovers',
-    'opp_turnovers',
-    'fouls_committed',
-    'fouls_drawn',
-    'possessions',
-    'opp_possessions',
-    'fastbreak',
-    'from_turnover',
-    'second_chance',
-    'points_in_paint',
-    'opp_from_turnover',
-    'opp_fastbreak',
-    'opp_second_chance',
-    'opp_points_in_paint',
-    'unscaled_pace'
-]
-
 # Hou test case, save as test_team
 if test:
-    df = team_lineup_stats['HOU']
-    df = df[columns]
+    df = team_lineup_stats.frame('HOU')
     df.to_csv("test_team.csv", index=False)
-
-
-if not test:
-    # Define the subfolder where you want to save files
-    save_dir = os.path.join("S2")
-
-    # Create the folder if it doesn’t exist
-    os.makedirs(save_dir, exist_ok=True)
-
-    # Create empty files if they don’t exist
-    for abbrev in team_abbrevs:
-        filename = f"S2_{abbrev}_2025_26.csv"
-        file_path = os.path.join(save_dir, filename)
-        if not os.path.exists(file_path):
-            pd.DataFrame(columns=columns).to_csv(file_path, index=False)
-
-    # Append or write team data
-    for team in team_lineup_stats.keys():
-        df = team_lineup_stats[team]
-        # Reorder columns explicitly before writing
-        df = df[columns]
-        csv_path = os.path.join(save_dir, f"S2_{team}_2025_26.csv")
-
-        # If file exists, append without header
-        if os.path.exists(csv_path):
-            df.to_csv(csv_path, mode='a', header=False, index=False)
-        else:
-            # First batch — write with header
-            df.to_csv(csv_path, index=False)
-
-
-
@@ -0,0 +1,100 @@
+from collections import namedtuple
+from datetime import datetime
+import os
+import threading
+import pandas as pd
+from lineup_aggregates import file_stamp
+from lineup_index import season_index
+from lineup_store import DATA_DIR, SEASON_SUFFIXES, STORE
+
+PLAYERS_PATH = os.path.join(DATA_DIR, 'active25.csv')
+INJURIES_PATH = os.path.join(DATA_DIR, 'injuries25.csv')
+
+# How often the version marker and the player/injury files are checked
+CHECK_SECONDS = 30
+
+# Everything the API serves from, built together and never modified once built
+DataSnapshot = namedtuple('DataSnapshot', ['version', 'number', 'built_at', 'lineups', 'players', 'injuries'])
+
+
+def records(path):
+    df = pd.read_csv(path)
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def data_version(store=STORE):
+    """
+    Version of the data behind a snapshot: the ingestion marker (or, before ingestion has
+    written one, every season's file version) plus the player and injury files.
+    """
+    lineups = file_stamp(store.marker)
+    if lineups is None:
+        lineups = [store.version(season) for season in SEASON_SUFFIXES]
+    return str(lineups), str(file_stamp(PLAYERS_PATH)), str(file_stamp(INJURIES_PATH))
+
+
+def build_snapshot(version, number):
+    """Parse and index every file the API reads, off the request path."""
+    return DataSnapshot(
+        version=version,
+        number=number,
+        built_at=datetime.now(),
+        lineups={season: season_index(season) for season in SEASON_SUFFIXES},
+        players=records(PLAYERS_PATH),
+        injuries=records(INJURIES_PATH),
+    )
+
+
+class SnapshotStore:
+    """
+    The API's current DataSnapshot, swapped for a new one whenever the data version changes.
+
+    The next snapshot is built on a background thread and replaces the current one in a
+    single assignment. A request reads current once and keeps that snapshot until it's
+    done, so a swap never changes data under a request that is already running.
+    """
+
+    def __init__(self, check_seconds=CHECK_SECONDS):
+        self.check_seconds = check_seconds
+        self.current = None
+        self.building = threading.Lock()
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def get(self):
+        return self.current
+
+    def refresh(self, force=False):
+        """Build and swap in a new snapshot if the data version changed (or force)."""
+        with self.building:
+            version = data_version()
+            current = self.current
+            if current is not None and current.version == version and not force:
+                return current
+            number = 1 if current is None else current.number + 1
+            self.current = build_snapshot(version, number)
+            return self.current
+
+    def run(self):
+        while not self.stopping.wait(self.check_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                serving = 'no snapshot yet' if self.current is None else f"still serving snapshot {self.current.number}"
+                print(f"[⚠️ Data Snapshot] Rebuild failed, {serving}: {e}")
+
+    def start(self):
+        """Build the first snapshot now, then watch for new data from a daemon thread."""
+        if self.current is None:
+            self.refresh()
+        if self.thread is None or not self.thread.is_alive():
+            self.stopping.clear()
+            self.thread = threading.Thread(target=self.run, name='snapshot-refresh', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+
+
+# Shared snapshot of the API server
+SNAPSHOT = SnapshotStore()
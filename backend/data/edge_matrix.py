@@ -0,0 +1,181 @@
+import hashlib
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from lineup_aggregates import AGGREGATES
+from lineup_windows import WINDOWS
+
+# One pregame edge: offense is what a team produces (numerator per 100 of a possession
+# column), defense is what it allows. An edge pairs a team's offense with its opponent's defense.
+Metric = namedtuple('Metric', ['name', 'offense', 'offense_per', 'defense', 'defense_per'])
+
+# Every edge, declared once; baselines and the edge matrix are both evaluated from this list.
+# Report order is ORtg, REB_per100, SecondCh_per100, FBP_per100, PtsOffTO_per100, PITP_per100, TO_per100
+METRICS = [
+    Metric('ORtg', 'points', 'possessions', 'opp_points', 'opp_possessions'),
+    Metric('REB/100 Poss', 'rebounds', 'possessions', 'opp_rebounds', 'opp_possessions'),
+    Metric('SecondChance/100 Poss', 'second_chance', 'possessions', 'opp_second_chance', 'opp_possessions'),
+    Metric('FastBreak/100 Poss', 'fastbreak', 'possessions', 'opp_fastbreak', 'opp_possessions'),
+    Metric('PtsOffTurnover/100 Poss', 'from_turnover', 'possessions', 'opp_from_turnover', 'opp_possessions'),
+    Metric('PointsInPaint/100 Poss', 'points_in_paint', 'possessions', 'opp_points_in_paint', 'opp_possessions'),
+    Metric('ForcedTO/100 Poss', 'opp_turnovers', 'opp_possessions', 'turnovers', 'possessions'),
+]
+
+
+def stat_columns(metrics=METRICS):
+    """Lineup columns the metrics read, in first-use order."""
+    columns = []
+    for metric in metrics:
+        for col in metric[1:]:
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+
+def metrics_version(metrics=METRICS):
+    """Short hash of the metric definitions, so cached baselines change when a metric does."""
+    return hashlib.sha256(repr(list(metrics)).encode('utf-8')).hexdigest()[:12]
+
+
+def team_stats(season, teams, top_n=3, exclude_mask=None, metrics=METRICS, window=None):
+    """
+    Sums of the metrics' columns over each team's top_n lineups by minutes (one row per team).
+
+    window picks the games counted (see LineupWindows.sums, e.g. ('last', 10) or ('decay', 15));
+    None is the whole season from the materialized tables.
+    """
+    columns = stat_columns(metrics)
+    if window is None:
+        rows = [AGGREGATES.top_lineups(season, team, top_n, exclude_mask)[columns].sum() for team in teams]
+    else:
+        rows = [WINDOWS.top_lineups(season, team, window, top_n, exclude_mask)[columns].sum() for team in teams]
+    return pd.DataFrame(rows, index=list(teams), columns=columns)
+
+
+def top_lineup_stats(rows, top_n=3, metrics=METRICS):
+    """
+    Same sums as team_stats, straight from raw lineup rows (e.g. a point-in-time slice of a season).
+
+    Lineups are ranked by minutes within each team, ties broken by lineup_key like the
+    materialized tables.
+    """
+    columns = stat_columns(metrics)
+    lineups = rows.groupby(['team', 'lineup_key'])[['minutes_played'] + columns].sum().reset_index()
+    lineups = lineups.sort_values('minutes_played', ascending=False, kind='stable')
+    return lineups.groupby('team').head(top_n).groupby('team')[columns].sum()
+
+
+def per_100(possessions):
+    # Possessions in hundreds; a team without possessions divides by 1
+    possessions = np.asarray(possessions, dtype=float)
+    return np.where(possessions > 0, possessions / 100, 1)
+
+
+def team_rates(stats, metrics=METRICS):
+    """
+    Per-100 rates of every team for every metric, all metrics in one vectorized pass.
+
+    Returns:
+        offense: (teams, metrics) what each team produces
+        defense: (teams, metrics) what each team allows
+    """
+    return metric_rates(stats.to_numpy(dtype=float), list(stats.columns), metrics)
+
+
+def metric_rates(values, columns, metrics=METRICS):
+    """
+    team_rates on a plain array: values is (..., len(columns)) totals, e.g. (teams, columns)
+    or (bootstrap samples, columns). Returns offense and defense of shape (..., metrics).
+    """
+    col = {name: i for i, name in enumerate(columns)}
+    per = per_100(values)
+
+    def rates(numerators, denominators):
+        return values[..., [col[c] for c in numerators]] / per[..., [col[c] for c in denominators]]
+
+    offense = rates([m.offense for m in metrics], [m.offense_per for m in metrics])
+    defense = rates([m.defense for m in metrics], [m.defense_per for m in metrics])
+    return offense, defense
+
+
+def league_baselines(season, teams, top_n=3, metrics=METRICS, window=None):
+    """
+    League average and differential distribution of every metric over all teams' top lineups.
+
+    Returns:
+        league: (metrics,) average offensive rate
+        means, stds: (metrics,) mean and sample std of each team's differential vs the league
+    """
+    if len(teams) < 2:
+        print("Warning: No team data found for standards_values, using defaults")
+        return np.zeros(len(metrics)), np.zeros(len(metrics)), np.ones(len(metrics))
+
+    return baselines_from_rates(*team_rates(team_stats(season, teams, top_n, metrics=metrics, window=window), metrics))
+
+
+def baselines_from_rates(offense, defense):
+    """League average, differential mean and differential std of each metric from (teams, metrics) rates."""
+    league = offense.mean(axis=0)
+    differentials = 0.5 * (offense + defense) - league
+    return league, differentials.mean(axis=0), differentials.std(axis=0, ddof=1)
+
+
+class EdgeMatrix:
+    """
+    Z-scored edges of every team against every other team, for all metrics at once.
+
+    edges[t, o, m] is team t's edge on metric m against opponent o: the average of t's
+    offensive rate and o's defensive rate, minus the league average, standardized with
+    the league differential mean and std. Any matchup, scheduled or not, is a lookup.
+
+    Args:
+        teams: team tricodes, in row order.
+        offense, defense: (teams, metrics) per-100 rates from team_rates.
+        league, means, stds: per-metric league average, differential mean and differential std.
+    """
+
+    def __init__(self, teams, offense, defense, league, means, stds):
+        self.teams = list(teams)
+        self.index = {team: i for i, team in enumerate(self.teams)}
+        self.offense = offense
+        self.defense = defense
+        self.league = np.asarray(league)
+        self.means = np.asarray(means)
+        self.stds = np.asarray(stds)
+
+        # (teams, 1, m) + (1, teams, m) -> (teams, teams, m)
+        expected = 0.5 * (offense[:, None, :] + defense[None, :, :])
+        self.edges = self.standardize(expected)
+
+    def standardize(self, expected):
+        """Z-score expected per-100 values (..., metrics) against the league baselines."""
+        # A metric with no spread across teams (or a degenerate window) divides by 1
+        stds = np.where(self.stds > 0, self.stds, 1)
+        return ((expected - self.league) - self.means) / stds
+
+    def __contains__(self, team):
+        return team in self.index
+
+    def edge(self, team, opponent):
+        """Edge of team against opponent on every metric, in METRICS order."""
+        return self.edges[self.index[team], self.index[opponent]]
+
+
+def build_edge_matrix(season, teams, baselines, top_n=3, exclude_mask=None, metrics=METRICS, window=None):
+    """
+    Edge matrix of a season from each team's top lineups.
+
+    Args:
+        teams: row teams; LineupStore.teams, the team CSVs that team_stats reads (through
+            load_lineups, which only uses parquet while it matches them).
+        baselines: standards_values() tuple (differential means, stds, league averages; one per metric each).
+        exclude_mask: player bitset whose lineups are skipped (injuries, players sitting).
+        window: games counted for each team (None for the whole season).
+    """
+    n = len(metrics)
+    means = baselines[:n]
+    stds = baselines[n:2 * n]
+    league = baselines[2 * n:3 * n]
+
+    offense, defense = team_rates(team_stats(season, teams, top_n, exclude_mask, metrics, window), metrics)
+    return EdgeMatrix(teams, offense, defense, league, means, stds)
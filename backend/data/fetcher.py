@@ -0,0 +1,155 @@
+import json
+import random
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# stats.nba.com starts refusing connections well before this, so every worker
+# shares one bucket and the total request rate never goes above it
+MAX_REQUESTS_PER_SECOND = 5.0
+REQUESTS_PER_WORKER = 1.0
+
+# Attempts allowed per game, shared across all of its endpoints
+RETRY_BUDGET = 4
+
+FetchResult = namedtuple('FetchResult', ['game_id', 'payloads', 'error'])
+
+
+class GameNotPlayedError(Exception):
+    """Raised when the NBA API has no data yet for a scheduled game."""
+    pass
+
+
+class FetchError(Exception):
+    """Raised when a game could not be fetched within its retry budget."""
+    pass
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by all fetch workers.
+
+    Args:
+        rate: tokens added per second.
+        capacity: maximum burst size (defaults to one second of tokens).
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def backoff_delay(attempt, base=5.0, cap=60.0):
+    # Exponential backoff with jitter so workers that failed together don't retry together
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def is_not_played(e):
+    # Errors the API gives back for games that haven't tipped off yet
+    return "'NoneType' object has no attribute 'keys'" in str(e) or "Expecting value" in str(e)
+
+
+def fetch_game(game_id, loaders, bucket, retry_budget=RETRY_BUDGET, store=None, offline=False):
+    """
+    Fetch every endpoint payload for a single game, reading from the raw store first.
+
+    Args:
+        game_id: NBA game id.
+        loaders: dict of endpoint name -> function(game_id) returning the raw JSON payload.
+        bucket: TokenBucket shared with the other workers.
+        retry_budget: total attempts allowed for this game across all endpoints.
+        store: optional RawPayloadStore checked before going to the network.
+        offline: if True, never touch the network; uncached payloads are an error.
+
+    Returns:
+        payloads: dict of endpoint name -> raw JSON payload
+    """
+    payloads = {}
+    attempts = 0
+    for name, loader in loaders.items():
+        if store is not None:
+            cached = store.get(name, game_id)
+            if cached is not None:
+                payloads[name] = cached
+                continue
+        if offline:
+            raise FetchError(f"Game {game_id} has no cached {name} payload")
+
+        while True:
+            bucket.acquire()
+            attempts += 1
+            try:
+                payloads[name] = loader(game_id)
+                break
+            except Exception as e:
+                if is_not_played(e):
+                    raise GameNotPlayedError(f"Game {game_id} not played yet: {e}") from e
+                if attempts >= retry_budget:
+                    raise FetchError(f"Game {game_id} failed after {attempts} attempts ({name}): {e}") from e
+                print(f"Attempt {attempts} failed for game {game_id} ({name}): {str(e)}")
+                time.sleep(backoff_delay(attempts - 1))
+    return payloads
+
+
+def fetch_games(game_ids, loaders, concurrency=4, store=None, offline=False):
+    """
+    Fetch many games through a bounded worker pool and yield them in schedule order.
+
+    Only `concurrency` games (times a small lookahead) are in flight at once and the
+    request rate scales with the worker count, capped at MAX_REQUESTS_PER_SECOND.
+    Closing the generator early (e.g. breaking out of the loop) cancels pending games.
+    Payloads already in `store` are served from disk without using the rate limit.
+
+    Yields:
+        FetchResult(game_id, payloads, error) where error is None on success
+    """
+    rate = min(concurrency * REQUESTS_PER_WORKER, MAX_REQUESTS_PER_SECOND)
+    bucket = TokenBucket(rate)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    pending = deque()
+    game_iter = iter(game_ids)
+
+    def submit_next():
+        for game_id in game_iter:
+            pending.append((game_id, executor.submit(fetch_game, game_id, loaders, bucket, store=store, offline=offline)))
+            return
+
+    try:
+        for _ in range(concurrency * 2):
+            submit_next()
+        while pending:
+            game_id, future = pending.popleft()
+            submit_next()
+            try:
+                yield FetchResult(game_id, future.result(), None)
+            except (GameNotPlayedError, FetchError) as e:
+                yield FetchResult(game_id, None, e)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def stats_frames(endpoint_cls, payload, **kwargs):
+    """Rebuild an nba_api stats endpoint's DataFrames from its raw JSON payload."""
+    from nba_api.stats.library.http import NBAStatsResponse
+
+    endpoint = endpoint_cls(get_request=False, **kwargs)
+    endpoint.nba_response = NBAStatsResponse(response=json.dumps(payload), status_code=200, url=None)
+    endpoint.load_response()
+    return endpoint.get_data_frames()
@@ -0,0 +1,155 @@
+import json
+import os
+import pandas as pd
+from lineup_keys import has_any, lineup_bitsets
+from lineup_store import STORE_DIR, file_stamp, load_lineups, team_csv_path
+
+# Lineup columns summed into the aggregate tables (S1 files only have some of them)
+SUM_COLUMNS = [
+    'minutes_played', 'points', 'opp_points', 'rebounds', 'opp_rebounds',
+    'assists', 'opp_assists', 'turnovers', 'opp_turnovers',
+    'fastbreak', 'from_turnover', 'second_chance', 'points_in_paint',
+    'opp_from_turnover', 'opp_fastbreak', 'opp_second_chance', 'opp_points_in_paint',
+    'possessions', 'opp_possessions',
+]
+
+
+def aggregate_rows(rows):
+    """Per-lineup sums of SUM_COLUMNS plus games and periods (lineup-period rows) for a team's rows."""
+    sums = [col for col in SUM_COLUMNS if col in rows.columns]
+    grouped = rows.groupby('lineup_key')
+    table = grouped[sums].sum()
+    table['games'] = grouped['game_id'].nunique()
+    table['periods'] = grouped.size()
+    return table
+
+
+class LineupAggregates:
+    """
+    Materialized per-team lineup table: one row per lineup_key with the season sums.
+
+    Ingestion keeps it current with update(), which subtracts the rows a batch replaced
+    and adds the new ones instead of regrouping the whole team file. Each table is saved
+    with the (size, mtime) stamp of the team CSV it describes; if the CSV changes any other
+    way, the next read rebuilds the table from the file. Tables are held in memory sorted by
+    minutes, together with a player bitset per lineup, so top_lineups() is a slice after one
+    vectorized AND against an exclusion mask.
+
+    Args:
+        root: directory of the saved tables (defaults to data/store/lineup_agg).
+    """
+
+    def __init__(self, root=os.path.join(STORE_DIR, 'lineup_agg')):
+        self.root = root
+        self.tables = {}
+        self.ranked = {}
+        self.bitsets = {}
+
+    def path(self, season, team):
+        return os.path.join(self.root, season, f"{team}.json")
+
+    def table(self, season, team):
+        """Aggregate table of a team, indexed by lineup_key and sorted by minutes played (desc)."""
+        stamp = file_stamp(team_csv_path(season, team))
+        table = self.current(season, team, stamp)
+        if table is None:
+            table = self.rebuild(season, team)
+        return table
+
+    def top_lineups(self, season, team, n=3, exclude_mask=None):
+        """
+        The n lineups with the most minutes, skipping any lineup with an excluded player.
+
+        Args:
+            exclude_mask: player bitset of who is out (LineupRegistry.mask, e.g. injuries
+                or "what if X sits").
+
+        Returns:
+            DataFrame of aggregate rows with a lineup_key column
+        """
+        self.table(season, team)
+        ranked = self.ranked[(season, team)]
+        if exclude_mask is None:
+            return ranked.iloc[:n]
+        keep = ~has_any(self.bitsets[(season, team)], exclude_mask)
+        return ranked.iloc[keep.nonzero()[0][:n]]
+
+    def update(self, season, team, replaced, added, base_stamp):
+        """
+        Apply one write_team_games batch to a team's table.
+
+        Args:
+            replaced: rows the write removed (previous version of the batch's games), or None.
+            added: rows the write added.
+            base_stamp: file_stamp of the team CSV before the write; if the saved table doesn't
+                match it, the table is rebuilt from the updated file instead.
+        """
+        table = self.current(season, team, base_stamp) if base_stamp is not None else None
+        if table is None:
+            self.rebuild(season, team)
+            return
+
+        removed = aggregate_rows(replaced) if replaced is not None and len(replaced) else None
+        new = aggregate_rows(added)
+        index = table.index.union(new.index)
+        table = table.reindex(index, fill_value=0)
+        if removed is not None:
+            table = table - removed.reindex(index, columns=table.columns, fill_value=0)
+        table = table + new.reindex(index, columns=table.columns, fill_value=0)
+        table = table[table['periods'] > 0]
+
+        self.store(season, team, table, file_stamp(team_csv_path(season, team)))
+
+    def rebuild(self, season, team):
+        # Same reader as LineupWindows, so both describe the same rows of a team file
+        stamp = file_stamp(team_csv_path(season, team))
+        table = aggregate_rows(load_lineups(season, teams=[team]))
+        return self.store(season, team, table, stamp)
+
+    def current(self, season, team, stamp):
+        """Table matching the given CSV stamp (memory first, then disk), else None."""
+        cached = self.tables.get((season, team))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        path = self.path(season, team)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved['stamp'] != stamp:
+            return None
+        table = pd.DataFrame(saved['columns'], index=pd.Index(saved['lineup_key'], name='lineup_key'))
+        return self.cache(season, team, table, stamp)
+
+    def cache(self, season, team, table, stamp):
+        table = self.sort(table)
+        self.tables[(season, team)] = (stamp, table)
+        self.ranked[(season, team)] = table.reset_index()
+        self.bitsets[(season, team)] = lineup_bitsets(table.index.to_numpy())
+        return table
+
+    def store(self, season, team, table, stamp):
+        table = self.cache(season, team, table, stamp)
+
+        # Write to a temp file and swap it in so a crash never leaves a half-written table
+        path = self.path(season, team)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'stamp': stamp,
+                'lineup_key': table.index.tolist(),
+                'columns': {col: table[col].tolist() for col in table.columns},
+            }, f)
+        os.replace(tmp_path, path)
+        return table
+
+    @staticmethod
+    def sort(table):
+        # Lineup order breaks ties, same as groupby(...).nlargest on the raw rows
+        return table.sort_index().sort_values('minutes_played', ascending=False, kind='stable')
+
+
+# Shared tables for readers that don't need a custom root
+AGGREGATES = LineupAggregates()
@@ -0,0 +1,138 @@
+import os
+import numpy as np
+import pandas as pd
+from lineup_keys import LineupRegistry
+from lineup_store import DATA_DIR, SEASON_SUFFIXES, STORE, column_type, pa, team_csv_path
+
+# Export format -> media type
+EXPORT_FORMATS = {
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def season_label(season):
+    """'S2' -> '2025-26', the value of the export's season column."""
+    return SEASON_SUFFIXES[season].replace('_', '-')
+
+
+def season_columns(season, store=STORE):
+    """Columns of a season's lineup rows, from the header of its first team file."""
+    for team in store.teams(season):
+        path = team_csv_path(season, team)
+        if os.path.exists(path):
+            return list(pd.read_csv(path, nrows=0).columns)
+    return []
+
+
+def export_columns(seasons, store=STORE):
+    """
+    'season' plus every column of any of the seasons, in first-seen order (S1 files have fewer),
+    with the decoded 'lineup' right after lineup_key.
+    """
+    columns = ['season']
+    for season in seasons:
+        for col in season_columns(season, store):
+            if col not in columns:
+                columns.append(col)
+                if col == 'lineup_key':
+                    columns.append('lineup')
+    return columns
+
+
+def season_registry(season):
+    return LineupRegistry(os.path.join(DATA_DIR, season, 'lineup_players.csv'))
+
+
+def lineup_labels(registry, keys):
+    """
+    Player names of each lineup_key ('Player A, Player B, ...'). Keys are season-local, so
+    they are decoded with that season's registry; each distinct key in a batch is decoded once.
+    """
+    unique, inverse = np.unique(np.asarray(keys, dtype=np.int64), return_inverse=True)
+    return np.array([registry.label(key) for key in unique], dtype=object)[inverse]
+
+
+def ndjson_chunks(seasons, teams=None, game_numbers=None, periods=None, store=STORE):
+    """
+    Lineup rows as newline-delimited JSON, one encoded chunk per store batch.
+
+    Columns a season doesn't have are left out of its rows.
+    """
+    for season in seasons:
+        registry = season_registry(season)
+        for df in store.scan_frames(season, teams=teams, game_numbers=game_numbers, periods=periods):
+            df.insert(0, 'season', season_label(season))
+            df.insert(df.columns.get_loc('lineup_key') + 1, 'lineup', lineup_labels(registry, df['lineup_key']))
+            text = df.to_json(orient='records', lines=True)
+            yield (text if text.endswith('\n') else text + '\n').encode('utf-8')
+
+
+class ChunkSink:
+    """Write target of the Arrow stream writer; collects bytes until drained."""
+
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def arrow_chunks(seasons, teams=None, game_numbers=None, periods=None, store=STORE):
+    """
+    Lineup rows as one Arrow IPC stream, written batch by batch straight from the store.
+
+    Every season shares one schema (export_columns); columns a season doesn't have are null.
+    """
+    if pa is None:
+        raise RuntimeError("Arrow export needs pyarrow")
+    schema = pa.schema([(col, pa.string() if col in ('season', 'lineup') else column_type(col))
+                        for col in export_columns(seasons, store)])
+
+    sink = ChunkSink()
+    writer = pa.ipc.new_stream(pa.PythonFile(sink, mode='w'), schema)
+    yield sink.drain()
+    for season in seasons:
+        if store.available(season):
+            batches = store.scan(season, teams=teams, game_numbers=game_numbers, periods=periods)
+        else:
+            batches = (pa.RecordBatch.from_pandas(df, preserve_index=False)
+                       for df in store.scan_frames(season, teams=teams, game_numbers=game_numbers, periods=periods))
+        label = season_label(season)
+        registry = season_registry(season)
+        for batch in batches:
+            if batch.num_rows == 0:
+                continue
+            lineups = lineup_labels(registry, batch.column('lineup_key').to_numpy())
+            writer.write_batch(conform(batch, schema, label, lineups))
+            yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def conform(batch, schema, label, lineups):
+    """batch with the export schema's columns, types, season label and lineup names."""
+    arrays = []
+    for field in schema:
+        if field.name == 'season':
+            arrays.append(pa.array([label] * batch.num_rows, pa.string()))
+        elif field.name == 'lineup':
+            arrays.append(pa.array(lineups, pa.string()))
+        elif field.name in batch.schema.names:
+            arrays.append(batch.column(field.name).cast(field.type))
+        else:
+            arrays.append(pa.nulls(batch.num_rows, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
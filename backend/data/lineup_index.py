@@ -0,0 +1,166 @@
+import os
+import numpy as np
+from lineup_aggregates import SUM_COLUMNS
+from lineup_keys import LineupRegistry
+from lineup_store import DATA_DIR, load_lineups
+
+# Columns summed per lineup for /lineup-stats (S1 files only have some of them)
+STAT_COLUMNS = SUM_COLUMNS + ['fouls_committed', 'fouls_drawn', 'unscaled_pace']
+
+# net_<stat> = team stat minus opponent stat
+NET_COLUMNS = {
+    'net_points': ('points', 'opp_points'),
+    'net_rebounds': ('rebounds', 'opp_rebounds'),
+    'net_assists': ('assists', 'opp_assists'),
+    'net_turnovers': ('turnovers', 'opp_turnovers'),
+    'net_fouls': ('fouls_committed', 'fouls_drawn'),
+    'net_second_chance': ('second_chance', 'opp_second_chance'),
+    'net_fastbreak': ('fastbreak', 'opp_fastbreak'),
+    'net_from_turnover': ('from_turnover', 'opp_from_turnover'),
+    'net_points_in_paint': ('points_in_paint', 'opp_points_in_paint'),
+}
+
+# Sort keys that are never scaled per minute / per 100 possessions
+UNSCALED = ('minutes_played', 'pace', 'team_avg_height')
+
+# Overtime periods are all counted as period 5
+MAX_PERIOD = 5
+
+
+class LineupIndex:
+    """
+    A season's lineup rows held as NumPy columns, for filtered, sorted and paged lineup tables.
+
+    Rows are sorted by (team, lineup_key) once, so after filtering on team, period and
+    game range the rows of a lineup are still contiguous and one reduceat sums every
+    column of every lineup. Only the requested page is turned into dicts.
+
+    Args:
+        rows: every lineup row of the season (team, lineup_key, period, game_number and stats).
+        registry: LineupRegistry of the season, to label lineups.
+    """
+
+    def __init__(self, rows, registry):
+        self.registry = registry
+        rows = rows.sort_values(['team', 'lineup_key'], kind='stable')
+        self.teams, self.team_idx = np.unique(rows['team'].to_numpy(dtype=str), return_inverse=True)
+        self.lineup_key = rows['lineup_key'].to_numpy(dtype=np.int64)
+        self.period = np.minimum(rows['period'].to_numpy(dtype=np.int64), MAX_PERIOD)
+        self.game_number = rows['game_number'].to_numpy(dtype=np.int64)
+
+        # Height is averaged over a lineup's rows, everything else summed
+        self.columns = [col for col in STAT_COLUMNS if col in rows.columns] + ['team_avg_height', 'rows']
+        self.values = np.column_stack([
+            rows[self.columns[:-2]].to_numpy(dtype=float),
+            rows['team_avg_height'].to_numpy(dtype=float),
+            np.ones(len(rows)),
+        ]) if len(rows) else np.zeros((0, len(self.columns)))
+
+        # Group id of each row: a new group wherever team or lineup_key changes
+        new_group = np.ones(len(rows), dtype=bool)
+        new_group[1:] = (self.team_idx[1:] != self.team_idx[:-1]) | (self.lineup_key[1:] != self.lineup_key[:-1])
+        self.group = np.cumsum(new_group) - 1
+
+    def lineups(self, teams=None, periods=None, game_range=None):
+        """
+        Per-lineup sums of the rows matching the filters.
+
+        Returns:
+            team_idx, lineup_key: (lineups,) arrays
+            sums: (lineups, columns) with team_avg_height already averaged
+        """
+        keep = np.ones(len(self.group), dtype=bool)
+        if teams is not None:
+            wanted = np.isin(self.teams, list(teams))
+            keep &= wanted[self.team_idx]
+        if periods is not None:
+            wanted = np.zeros(MAX_PERIOD + 1, dtype=bool)
+            wanted[[min(int(p), MAX_PERIOD) for p in periods]] = True
+            keep &= wanted[self.period]
+        if game_range is not None:
+            keep &= (self.game_number >= game_range[0]) & (self.game_number <= game_range[1])
+
+        rows = np.flatnonzero(keep)
+        if len(rows) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros((0, len(self.columns)))
+        group = self.group[rows]
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        sums = np.add.reduceat(self.values[rows], starts, axis=0)
+        sums[:, -2] /= sums[:, -1]
+        first = rows[starts]
+        return self.team_idx[first], self.lineup_key[first], sums
+
+    def sort_keys(self):
+        """Everything query() can sort on: the summed columns, net_<stat> of columns the season has, and pace."""
+        nets = {name for name, (team, opp) in NET_COLUMNS.items() if team in self.columns and opp in self.columns}
+        return set(self.columns[:-1]) | nets | {'pace'}
+
+    def sort_values(self, sums, sort_by, scale='total'):
+        """Values lineups are sorted on: a stat, a net_<stat>, pace or height, optionally per minute or per 100 possessions."""
+        col = {name: i for i, name in enumerate(self.columns)}
+
+        def column(name):
+            return sums[:, col[name]] if name in col else np.zeros(len(sums))
+
+        minutes = column('minutes_played')
+        if sort_by == 'pace':
+            return np.divide(column('unscaled_pace') * 24, minutes, out=np.zeros(len(sums)), where=minutes > 0)
+        if sort_by in NET_COLUMNS:
+            team, opp = NET_COLUMNS[sort_by]
+            values = column(team) - column(opp)
+        else:
+            values = column(sort_by)
+
+        if sort_by in UNSCALED or scale == 'total':
+            return values
+        denominators = column('possessions') / 100 if scale == 'per_100' else minutes
+        return np.divide(values, denominators, out=np.zeros(len(sums)), where=denominators > 0)
+
+    def query(self, teams=None, periods=None, game_range=None, min_minutes=None, max_minutes=None,
+              sort_by='minutes_played', order='desc', scale='total', page=1, page_size=10):
+        """
+        One page of the lineup table.
+
+        Args:
+            teams, periods, game_range: row filters (None keeps everything).
+            min_minutes, max_minutes: inclusive filter on a lineup's total minutes.
+            sort_by: stat column, net_<stat>, 'pace' or 'team_avg_height'.
+            order: 'asc' or 'desc'.
+            scale: 'total', 'per_minute' or 'per_100' (what sort_by is compared on).
+            page, page_size: 1-based page of the sorted lineups.
+
+        Returns:
+            total: number of lineups matching the filters
+            rows: list of dicts for the page (lineup label, team and the summed columns)
+        """
+        if sort_by not in self.sort_keys():
+            raise ValueError(f"Unknown sort key {sort_by!r}")
+        team_idx, keys, sums = self.lineups(teams, periods, game_range)
+        minutes = sums[:, self.columns.index('minutes_played')]
+        keep = np.ones(len(keys), dtype=bool)
+        if min_minutes is not None:
+            keep &= minutes >= min_minutes
+        if max_minutes is not None:
+            keep &= minutes <= max_minutes
+        team_idx, keys, sums = team_idx[keep], keys[keep], sums[keep]
+
+        values = self.sort_values(sums, sort_by, scale)
+        ranked = np.argsort(-values if order == 'desc' else values, kind='stable')
+        start = (max(int(page), 1) - 1) * page_size
+        page_rows = ranked[start:start + page_size]
+        return len(keys), [self.row(team_idx[i], keys[i], sums[i]) for i in page_rows]
+
+    def row(self, team_idx, lineup_key, sums):
+        row = {'lineup': self.registry.label(lineup_key), 'lineup_key': str(lineup_key), 'team': str(self.teams[team_idx])}
+        for name, value in zip(self.columns[:-1], sums[:-1]):
+            row[name] = float(value)
+        for name, (team, opp) in NET_COLUMNS.items():
+            row[name] = row.get(team, 0.0) - row.get(opp, 0.0)
+        return row
+
+
+def season_index(season):
+    """LineupIndex of a season, read from the lineup store."""
+    registry = LineupRegistry(os.path.join(DATA_DIR, season, 'lineup_players.csv'))
+    return LineupIndex(load_lineups(season), registry)
+
@@ -0,0 +1,149 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Each player gets a 12-bit code per season, so a five-man lineup packs into 60 bits
+CODE_BITS = 12
+CODE_MASK = (1 << CODE_BITS) - 1
+MAX_CODE = CODE_MASK
+LINEUP_SIZE = 5
+SHIFTS = np.arange(LINEUP_SIZE, dtype=np.int64) * CODE_BITS
+
+
+class LineupRegistry:
+    """
+    Per-season player registry used to encode lineups as single int64 keys.
+
+    Every player gets a small dense code (1..4095). A lineup key is its five codes,
+    sorted and packed 12 bits apart, so grouping, joins and equality on lineups are
+    integer operations. Codes are only ever appended, so keys stay valid as the
+    season grows. The registry is stored next to the team files as a CSV of
+    code, name, player_id.
+
+    Args:
+        path: registry CSV (e.g. S2/lineup_players.csv).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.codes = {}
+        self.names = {}
+        self.player_ids = {}
+        self.dirty = False
+        self.label_cache = {}
+
+        if os.path.exists(path):
+            df = pd.read_csv(path)
+            for code, name, player_id in zip(df['code'], df['name'], df['player_id']):
+                self.codes[name] = int(code)
+                self.names[int(code)] = name
+                if not pd.isna(player_id):
+                    self.player_ids[int(code)] = int(player_id)
+
+    def code(self, name, player_id=None):
+        """Code for a player name, registering the player if new."""
+        code = self.codes.get(name)
+        if code is None:
+            code = len(self.codes) + 1
+            if code > MAX_CODE:
+                raise ValueError(f"Lineup registry {self.path} is full ({MAX_CODE} players)")
+            self.codes[name] = code
+            self.names[code] = name
+            self.dirty = True
+        if player_id is not None and code not in self.player_ids:
+            self.player_ids[code] = int(player_id)
+            self.dirty = True
+        return code
+
+    def encode(self, lineup):
+        """Pack a lineup (iterable of five names) into its int64 key."""
+        codes = sorted(self.code(name) for name in lineup)
+        key = 0
+        for i, code in enumerate(codes):
+            key |= code << (i * CODE_BITS)
+        return key
+
+    def codes_for(self, names):
+        """Codes of the given names that are in the registry (unknown names are skipped)."""
+        return [self.codes[name] for name in names if name in self.codes]
+
+    def mask(self, names):
+        """Player bitset of the given names (see player_mask); unknown names are skipped."""
+        return player_mask(self.codes_for(names))
+
+    def names_of(self, key):
+        """Player names of a lineup key, sorted by name."""
+        codes = unpack(np.array([key], dtype=np.int64))[0]
+        return tuple(sorted(self.names[int(code)] for code in codes if code))
+
+    def label(self, key):
+        """Display string for a lineup key, e.g. 'Player A, Player B, ...'."""
+        key = int(key)
+        label = self.label_cache.get(key)
+        if label is None:
+            label = self.label_cache[key] = ', '.join(self.names_of(key))
+        return label
+
+    def save(self):
+        if not self.dirty:
+            return
+        df = pd.DataFrame({
+            'code': list(self.names.keys()),
+            'name': list(self.names.values()),
+            'player_id': [self.player_ids.get(code) for code in self.names],
+        })
+        df['player_id'] = df['player_id'].astype('Int64')
+        tmp_path = self.path + '.tmp'
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def unpack(keys):
+    """(n,) int64 lineup keys -> (n, 5) array of player codes."""
+    keys = np.asarray(keys, dtype=np.int64)
+    return (keys[:, None] >> SHIFTS) & CODE_MASK
+
+
+def contains_any(keys, codes):
+    """Boolean mask of the lineup keys that include any of the given player codes."""
+    keys = np.asarray(keys, dtype=np.int64)
+    if len(codes) == 0 or len(keys) == 0:
+        return np.zeros(len(keys), dtype=bool)
+    return np.isin(unpack(keys), np.asarray(list(codes), dtype=np.int64)).any(axis=1)
+
+
+def words_for(max_code):
+    # uint64 words needed to hold bit max_code
+    return int(max_code) // 64 + 1
+
+
+def lineup_bitsets(keys):
+    """
+    (n,) lineup keys -> (n, words) uint64 player bitsets, bit c set for every player code c.
+
+    The width follows the largest code in the keys, so a team's bitsets are a few words.
+    """
+    codes = unpack(keys)
+    width = words_for(codes.max()) if codes.size else 1
+    bits = np.zeros((len(codes), width), dtype=np.uint64)
+    rows = np.repeat(np.arange(len(codes)), LINEUP_SIZE)
+    flat = codes.ravel()
+    keep = flat > 0
+    np.bitwise_or.at(bits, (rows[keep], flat[keep] // 64), np.left_shift(np.uint64(1), (flat[keep] % 64).astype(np.uint64)))
+    return bits
+
+
+def player_mask(codes):
+    """Bitset of a set of player codes (e.g. everyone injured), comparable with lineup_bitsets."""
+    codes = np.asarray(list(codes), dtype=np.int64)
+    mask = np.zeros(words_for(codes.max()) if codes.size else 1, dtype=np.uint64)
+    for code in codes:
+        mask[code // 64] |= np.uint64(1) << np.uint64(code % 64)
+    return mask
+
+
+def has_any(bitsets, mask):
+    """Boolean mask of the lineups (rows of lineup_bitsets) that include any player in mask."""
+    width = min(bitsets.shape[1], len(mask))
+    return (bitsets[:, :width] & mask[:width]).any(axis=1)
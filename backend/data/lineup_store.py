@@ -0,0 +1,283 @@
+import glob
+import hashlib
+import json
+import os
+import pandas as pd
+
+# pyarrow is optional: without it (or before the store is built) reads fall back to the CSVs
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(DATA_DIR, 'store')
+
+# season folder -> file suffix of its team CSVs
+SEASON_SUFFIXES = {
+    'S1': '2024_25',
+    'S2': '2025_26',
+}
+
+# Stored type of every lineup column; counts are small ints, rates and minutes stay float64
+INT_COLUMNS = [
+    'points', 'opp_points', 'rebounds', 'opp_rebounds', 'assists', 'opp_assists',
+    'turnovers', 'opp_turnovers', 'fouls_committed', 'fouls_drawn',
+    'fastbreak', 'from_turnover', 'second_chance', 'points_in_paint',
+    'opp_from_turnover', 'opp_fastbreak', 'opp_second_chance', 'opp_points_in_paint',
+]
+FLOAT_COLUMNS = [
+    'team_avg_height', 'opp_avg_height', 'minutes_played',
+    'possessions', 'opp_possessions', 'unscaled_pace',
+]
+
+# Rows per parquet row group; row group min/max stats are what game_number/period filters skip on
+ROW_GROUP_SIZE = 2048
+
+# Rows per chunk when streaming a season (scan/scan_frames)
+SCAN_BATCH_ROWS = 16384
+
+# Parquet metadata key holding the file_stamp of the team CSV a partition was written from
+SOURCE_KEY = b'source_stamp'
+
+
+def column_type(name):
+    if name in ('game_id', 'lineup_key'):
+        return pa.int64()
+    if name in ('game_number', 'period'):
+        return pa.int16()
+    if name in INT_COLUMNS:
+        return pa.int32()
+    if name in FLOAT_COLUMNS:
+        return pa.float64()
+    return pa.string()
+
+
+def team_csv_path(season, team):
+    return os.path.join(DATA_DIR, season, f"{season}_{team}_{SEASON_SUFFIXES[season]}.csv")
+
+
+def file_stamp(path):
+    """(size, mtime) of a team file, or None if it doesn't exist yet."""
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class LineupStore:
+    """
+    Typed, columnar copy of the S1/S2 lineup files: one parquet file per season and team.
+
+    Layout is <root>/<season>/team=<TEAM>/part-0.parquet, so a team filter only opens that
+    team's file, and rows are sorted by game_number and period so filters on those skip
+    whole row groups. The team CSVs stay the source of truth; ingestion rewrites a team's
+    partition right after its CSV, and build_lineup_store.py converts existing CSVs.
+
+    Each partition records the file_stamp of the CSV it was written from. A season is only
+    read from parquet while every team's partition matches its CSV; after a pull, a hand
+    edit or an ingestion run without pyarrow, reads fall back to the CSVs until the stale
+    partitions are rebuilt.
+
+    Args:
+        root: store directory (defaults to data/store).
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        # Rewritten by ingestion after each finished batch; readers reload when it changes
+        self.marker = os.path.join(root, 'ingested')
+        # partition path -> ((size, mtime) of the partition, source stamp read from its metadata)
+        self.sources = {}
+
+    def available(self, season):
+        """True if the season can be read from parquet: pyarrow is installed and no partition is stale."""
+        return pa is not None and bool(self.partition_teams(season)) and not self.stale_teams(season)
+
+    def teams(self, season):
+        suffix = SEASON_SUFFIXES[season]
+        return sorted(os.path.basename(p)[len(season) + 1:-len(suffix) - 5]
+                      for p in glob.glob(os.path.join(DATA_DIR, season, f"{season}_*_{suffix}.csv")))
+
+    def partition_path(self, season, team):
+        return os.path.join(self.root, season, f"team={team}", 'part-0.parquet')
+
+    def partition_teams(self, season):
+        return sorted(os.path.basename(os.path.dirname(p)).split('=', 1)[1]
+                      for p in glob.glob(os.path.join(self.root, season, 'team=*', 'part-0.parquet')))
+
+    def source_stamp(self, path):
+        """file_stamp of the CSV a partition was written from (None if it predates stamps)."""
+        stat = os.stat(path)
+        key = (stat.st_size, stat.st_mtime_ns)
+        cached = self.sources.get(path)
+        if cached is None or cached[0] != key:
+            metadata = pq.read_schema(path).metadata or {}
+            cached = self.sources[path] = (key, json.loads(metadata[SOURCE_KEY]) if SOURCE_KEY in metadata else None)
+        return cached[1]
+
+    def stale_teams(self, season):
+        """
+        Teams whose partition doesn't match their CSV: missing, written from another version
+        of the CSV, or left over from a CSV that no longer exists.
+        """
+        csv_teams = self.teams(season)
+        stale = [team for team in csv_teams
+                 if not os.path.exists(self.partition_path(season, team))
+                 or self.source_stamp(self.partition_path(season, team)) != file_stamp(team_csv_path(season, team))]
+        return stale + sorted(set(self.partition_teams(season)) - set(csv_teams))
+
+    def has_team(self, season, team):
+        return os.path.exists(team_csv_path(season, team))
+
+    def version(self, season):
+        """
+        Data version of a season: a hash of every team CSV's name, size and mtime.
+
+        Ingestion rewrites the CSVs, so anything derived from a season can be cached
+        under this and recomputed only when a team file changes.
+        """
+        h = hashlib.sha256()
+        suffix = SEASON_SUFFIXES[season]
+        for path in sorted(glob.glob(os.path.join(DATA_DIR, season, f"{season}_*_{suffix}.csv"))):
+            stat = os.stat(path)
+            h.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}|".encode('utf-8'))
+        return h.hexdigest()
+
+    def mark_ingested(self, season):
+        """Record that a batch of season's team files is complete (the marker holds the season's new version)."""
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.marker + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(f"{season} {self.version(season)}\n")
+        os.replace(tmp_path, self.marker)
+
+    def write_team(self, season, team, df, source_stamp=None):
+        """
+        Replace a team's partition with df (the full team file, game_number included).
+
+        Args:
+            source_stamp: file_stamp of the CSV df was read from (defaults to the CSV as it is now,
+                for writers that just saved it).
+        """
+        if pa is None:
+            return
+        if source_stamp is None:
+            source_stamp = file_stamp(team_csv_path(season, team))
+        df = df.drop(columns='team', errors='ignore').sort_values(['game_number', 'period'], kind='stable')
+        schema = pa.schema([(col, column_type(col)) for col in df.columns])
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), SOURCE_KEY: json.dumps(source_stamp).encode('utf-8')})
+
+        path = self.partition_path(season, team)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
+
+    def load(self, season, columns=None, teams=None, game_numbers=None, periods=None):
+        """
+        Lineup rows of a season, reading only the requested columns and rows.
+
+        Args:
+            season: 'S1' or 'S2'.
+            columns: columns to return (all if None).
+            teams: team tricodes to keep (all if None).
+            game_numbers: inclusive (first, last) game_number range.
+            periods: periods to keep.
+
+        Returns:
+            DataFrame with the requested columns
+        """
+        if self.available(season):
+            return self.load_parquet(season, columns, teams, game_numbers, periods)
+        return self.load_csv(season, columns, teams, game_numbers, periods)
+
+    def load_parquet(self, season, columns, teams, game_numbers, periods):
+        dataset, names, expr = self.scan_args(season, columns, teams, game_numbers, periods)
+        return dataset.to_table(columns=names, filter=expr).to_pandas()
+
+    def scan_args(self, season, columns, teams, game_numbers, periods):
+        """Dataset of a season's partitions, the column list and the filter expression for a read."""
+        dataset = ds.dataset(
+            os.path.join(self.root, season), format='parquet',
+            partitioning=ds.partitioning(pa.schema([('team', pa.string())]), flavor='hive'),
+        )
+        expr = None
+        if teams is not None:
+            expr = ds.field('team').isin(list(teams))
+        if game_numbers is not None:
+            first, last = game_numbers
+            in_range = (ds.field('game_number') >= first) & (ds.field('game_number') <= last)
+            expr = in_range if expr is None else expr & in_range
+        if periods is not None:
+            in_periods = ds.field('period').isin(list(periods))
+            expr = in_periods if expr is None else expr & in_periods
+
+        names = columns if columns is not None else [f.name for f in dataset.schema if f.name != 'team'] + ['team']
+        return dataset, list(names), expr
+
+    def scan(self, season, columns=None, teams=None, game_numbers=None, periods=None, batch_rows=SCAN_BATCH_ROWS):
+        """
+        Lineup rows of a season as a stream of pyarrow RecordBatches (at most batch_rows each),
+        read from the parquet partitions as they are consumed. Same filters as load().
+        """
+        dataset, names, expr = self.scan_args(season, columns, teams, game_numbers, periods)
+        yield from dataset.scanner(columns=names, filter=expr, batch_size=batch_rows).to_batches()
+
+    def scan_frames(self, season, columns=None, teams=None, game_numbers=None, periods=None, batch_rows=SCAN_BATCH_ROWS):
+        """
+        Like scan(), as DataFrames; without the parquet store the team CSVs are read in chunks instead.
+        """
+        if self.available(season):
+            for batch in self.scan(season, columns, teams, game_numbers, periods, batch_rows):
+                if batch.num_rows:
+                    yield batch.to_pandas()
+            return
+
+        for team in (teams if teams is not None else self.teams(season)):
+            path = team_csv_path(season, team)
+            if not os.path.exists(path):
+                continue
+            for df in pd.read_csv(path, chunksize=batch_rows, float_precision='round_trip'):
+                if game_numbers is not None:
+                    df = df[df['game_number'].between(*game_numbers)]
+                if periods is not None:
+                    df = df[df['period'].isin(periods)]
+                if len(df):
+                    yield df[list(columns)] if columns is not None else df
+
+    def load_csv(self, season, columns, teams, game_numbers, periods):
+        # Filter columns have to be read even if they aren't returned
+        usecols = None
+        if columns is not None:
+            usecols = set(columns)
+            usecols.update(name for name, value in (('game_number', game_numbers), ('period', periods)) if value is not None)
+
+        frames = []
+        for team in (teams if teams is not None else self.teams(season)):
+            path = team_csv_path(season, team)
+            if not os.path.exists(path):
+                continue
+            df = pd.read_csv(path, usecols=lambda c: usecols is None or c in usecols, float_precision='round_trip')
+            if game_numbers is not None:
+                df = df[df['game_number'].between(*game_numbers)]
+            if periods is not None:
+                df = df[df['period'].isin(periods)]
+            frames.append(df)
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        df = pd.concat(frames, ignore_index=True)
+        return df[list(columns)] if columns is not None else df
+
+
+# Shared store for readers that don't need a custom root
+STORE = LineupStore()
+
+
+def load_lineups(season, columns=None, teams=None, game_numbers=None, periods=None):
+    """Lineup rows of a season from the default store (see LineupStore.load)."""
+    return STORE.load(season, columns=columns, teams=teams, game_numbers=game_numbers, periods=periods)
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+from lineup_aggregates import SUM_COLUMNS, file_stamp
+from lineup_keys import has_any, lineup_bitsets
+from lineup_store import load_lineups, team_csv_path
+
+
+class LineupWindows:
+    """
+    Per-lineup cumulative sums of a team's stat columns over the games each lineup played.
+
+    Only (lineup, game) pairs that exist are stored, sorted by lineup then game_number
+    (CSR-style: offsets[l]..offsets[l + 1] are lineup l's games). Each lineup's prefix sums
+    start from their own zero row, so a lineup's sums over any game range are two
+    searchsorted lookups and one subtraction. Exponentially decayed sums use a second prefix of
+    rate-scaled values (built once per half-life), so they are O(log games) per lineup too.
+
+    Args:
+        rows: the team's lineup rows (lineup_key, game_number and the stat columns).
+        columns: stat columns to keep sums of; 'games' and 'periods' are added.
+    """
+
+    def __init__(self, rows, columns=SUM_COLUMNS):
+        self.columns = [col for col in columns if col in rows.columns] + ['games', 'periods']
+        self.keys, lineup_idx = np.unique(rows['lineup_key'].to_numpy(dtype=np.int64), return_inverse=True)
+        self.n_games = int(rows['game_number'].max()) if len(rows) else 0
+        games = rows['game_number'].to_numpy(dtype=np.int64)
+
+        # One entry per (lineup, game) played; entry_key orders them by lineup, then game
+        self.stride = self.n_games + 2
+        self.entry_key, entry_idx = np.unique(lineup_idx * self.stride + games, return_inverse=True)
+        self.entry_games = self.entry_key % self.stride
+        values = np.zeros((len(self.entry_key), len(self.columns)))
+        np.add.at(values[:, :-2], entry_idx, rows[self.columns[:-2]].to_numpy(dtype=float))
+        np.add.at(values[:, -1], entry_idx, 1)
+        values[:, -2] = 1
+        self.values = values
+
+        self.offsets = np.searchsorted(self.entry_key, np.arange(len(self.keys) + 1) * self.stride)
+        self.entry_lineup = self.entry_key // self.stride
+        self.prefix = self.prefix_sums(values)
+        self.scaled = {}
+        self.bitsets = lineup_bitsets(self.keys)
+
+    def prefix_sums(self, values):
+        """
+        Per-lineup running sums of entry values: lineup l's zero row sits at offsets[l] + l and
+        its entry e at e + l + 1, so [lo, hi) of lineup l is prefix[hi + l] - prefix[lo + l].
+        """
+        prefix = np.zeros((len(values) + len(self.keys), values.shape[1]))
+        for l in range(len(self.keys)):
+            start, end = self.offsets[l], self.offsets[l + 1]
+            np.cumsum(values[start:end], axis=0, out=prefix[start + l + 1:end + l + 1])
+        return prefix
+
+    def window_sums(self, prefix, first, last):
+        """(lineups, columns) difference of prefix over every lineup's games first..last."""
+        lineups = np.arange(len(self.keys))
+        base = lineups * self.stride
+        lo = np.searchsorted(self.entry_key, base + first)
+        hi = np.searchsorted(self.entry_key, base + last, side='right')
+        return prefix[hi + lineups] - prefix[lo + lineups]
+
+    def range(self, first, last):
+        """(lineups, columns) sums over game_numbers first..last (inclusive, clipped to the season)."""
+        first = max(int(first), 1)
+        last = min(int(last), self.n_games)
+        if last < first:
+            return np.zeros((len(self.keys), len(self.columns)))
+        return self.window_sums(self.prefix, first, last)
+
+    def last_n(self, n):
+        """Sums over the team's last n games."""
+        return self.range(self.n_games - n + 1, self.n_games)
+
+    def decayed(self, half_life, last=None):
+        """
+        Exponentially decayed sums up to game `last` (default: latest), where a game
+        half_life games earlier counts half as much.
+        """
+        last = self.n_games if last is None else min(int(last), self.n_games)
+        rate = 2.0 ** (1.0 / half_life)
+        scaled = self.scaled.get(half_life)
+        if scaled is None:
+            # Game g scaled by rate**(g - n_games) keeps the largest weight at 1
+            scaled = self.scaled[half_life] = self.prefix_sums(self.values * (rate ** (self.entry_games - self.n_games))[:, None])
+        return self.window_sums(scaled, 0, last) * rate ** (self.n_games - last)
+
+    def sums(self, window):
+        """
+        Sums for a window spec: ('last', n), ('range', first, last) or ('decay', half_life).
+        """
+        kind = window[0]
+        if kind == 'last':
+            return self.last_n(window[1])
+        if kind == 'range':
+            return self.range(window[1], window[2])
+        if kind == 'decay':
+            return self.decayed(window[1])
+        raise ValueError(f"Unknown lineup window {window!r}")
+
+    def weights(self, window=None):
+        """(n_games + 1,) weight of each game_number in a window (all ones for the whole season)."""
+        games = np.arange(self.n_games + 1)
+        if window is None:
+            return np.ones(self.n_games + 1)
+        kind = window[0]
+        if kind == 'last':
+            return (games > self.n_games - window[1]).astype(float)
+        if kind == 'range':
+            return ((games >= window[1]) & (games <= window[2])).astype(float)
+        if kind == 'decay':
+            return 2.0 ** ((games - self.n_games) / window[1])
+        raise ValueError(f"Unknown lineup window {window!r}")
+
+    def game_totals(self, lineup_keys, window=None):
+        """
+        Per-game totals of a set of lineups, one row per game any of them played in the window.
+        A lineup_key the team doesn't have raises KeyError instead of reading another lineup's rows.
+
+        Returns:
+            (games, columns) array, weighted for decayed windows
+        """
+        lineup_keys = np.asarray(lineup_keys, dtype=np.int64)
+        lineups = np.searchsorted(self.keys, lineup_keys)
+        found = lineups < len(self.keys)
+        found[found] = self.keys[lineups[found]] == lineup_keys[found]
+        if not found.all():
+            raise KeyError(f"Lineups not in this team's rows: {lineup_keys[~found].tolist()}")
+        entries = np.concatenate([np.arange(self.offsets[l], self.offsets[l + 1]) for l in lineups]) \
+            if len(lineups) else np.zeros(0, dtype=np.int64)
+        totals = np.zeros((self.n_games + 1, len(self.columns)))
+        np.add.at(totals, self.entry_games[entries], self.values[entries])
+        totals *= self.weights(window)[:, None]
+        return totals[totals[:, self.columns.index('periods')] > 0]
+
+    def table(self, window, exclude_mask=None):
+        """
+        Lineup table for a window, like LineupAggregates.table: lineup_key plus the summed
+        columns, lineups that didn't play in the window dropped, sorted by minutes (desc).
+        """
+        sums = self.sums(window)
+        keep = sums[:, self.columns.index('periods')] > 0
+        if exclude_mask is not None:
+            keep &= ~has_any(self.bitsets, exclude_mask)
+        table = pd.DataFrame(sums[keep], columns=self.columns)
+        table.insert(0, 'lineup_key', self.keys[keep])
+        return table.sort_values('minutes_played', ascending=False, kind='stable').reset_index(drop=True)
+
+    def top_lineups(self, window, n=3, exclude_mask=None):
+        return self.table(window, exclude_mask).head(n)
+
+
+class LineupWindowCache:
+    """LineupWindows per (season, team), rebuilt when the team file changes."""
+
+    def __init__(self):
+        self.windows = {}
+
+    def get(self, season, team):
+        stamp = file_stamp(team_csv_path(season, team))
+        cached = self.windows.get((season, team))
+        if cached is None or cached[0] != stamp:
+            rows = load_lineups(season, teams=[team])
+            cached = self.windows[(season, team)] = (stamp, LineupWindows(rows))
+        return cached[1]
+
+    def top_lineups(self, season, team, window, n=3, exclude_mask=None):
+        return self.get(season, team).top_lineups(window, n, exclude_mask)
+
+
+# Shared per-team windows
+WINDOWS = LineupWindowCache()
@@ -0,0 +1,46 @@
+## CONVERT LINEUP STRINGS TO LINEUP KEYS
+# Rewrites the S1/S2 team files so the "('Player A', 'Player B', ...)" lineup column
+# becomes an integer lineup_key, registering every player in the season's lineup_players.csv.
+# Files that already have lineup_key are left alone, so this is safe to re-run.
+
+import ast
+import glob
+import os
+import pandas as pd
+from lineup_keys import LineupRegistry
+
+SEASONS = [
+    # folder, file suffix, nba_api players file used to fill in player ids
+    ('S1', '2024_25', 'playersAPI24.csv'),
+    ('S2', '2025_26', 'playersAPI25.csv'),
+]
+
+for season, suffix, players_path in SEASONS:
+    registry = LineupRegistry(os.path.join(season, 'lineup_players.csv'))
+    players_df = pd.read_csv(players_path)
+    player_ids = dict(zip(players_df['full_name'], players_df['id']))
+
+    for csv_path in sorted(glob.glob(os.path.join(season, f'{season}_*_{suffix}.csv'))):
+        # round_trip keeps every float exactly as written
+        df = pd.read_csv(csv_path, float_precision='round_trip')
+        if 'lineup' not in df.columns:
+            continue
+
+        keys = []
+        for lineup_str in df['lineup']:
+            lineup = ast.literal_eval(lineup_str)
+            for name in lineup:
+                registry.code(name, player_ids.get(name))
+            keys.append(registry.encode(lineup))
+
+        df.insert(df.columns.get_loc('lineup'), 'lineup_key', keys)
+        df = df.drop(columns='lineup')
+
+        # Save the registry first so every key written to a team file can be decoded
+        registry.save()
+        tmp_path = csv_path + '.tmp'
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, csv_path)
+        print(f"Converted {csv_path}")
+
+    registry.save()
@@ -0,0 +1,134 @@
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+# Box score / play-by-play spellings that differ from balldontlie's
+HEIGHT_NAME_CORRECTIONS = {
+    'Zach Lavine': 'Zach LaVine',
+    'Tobais Harris': 'Tobias Harris',
+}
+
+
+def height_to_inches(height):
+    # "6-6" -> 78
+    if not isinstance(height, str) or '-' not in height:
+        return None
+    feet, inches = height.split('-')
+    return int(feet) * 12 + int(inches)
+
+
+class HeightIndex:
+    """
+    Player name -> height in inches, built once per season from the balldontlie file.
+
+    Name corrections are applied while building, so lookups in the ingestion loop are
+    plain dictionary hits. Players without a height are collected in `unresolved` and
+    reported once per run.
+
+    Args:
+        bdl_df: balldontlie players (playersBDL24.csv / playersBDL25.csv).
+        corrections: dict of alternate spelling -> balldontlie "first last".
+    """
+
+    def __init__(self, bdl_df, corrections=HEIGHT_NAME_CORRECTIONS):
+        bdl_df = bdl_df.dropna(subset=['height']).drop_duplicates(['first_name', 'last_name'], keep='first')
+        self.by_name = {
+            first + ' ' + last: height_to_inches(height)
+            for first, last, height in zip(bdl_df['first_name'], bdl_df['last_name'], bdl_df['height'])
+            if isinstance(first, str) and isinstance(last, str)
+        }
+        for alias, name in corrections.items():
+            if name in self.by_name:
+                self.by_name[alias] = self.by_name[name]
+        self.unresolved = set()
+
+    def inches(self, name):
+        height = self.by_name.get(name)
+        if height is None:
+            self.unresolved.add(name)
+        return height
+
+    def lineup_averages(self, lineups):
+        """
+        Average height of each lineup (sequence of equal-sized player name tuples).
+
+        A player without a height counts as 0 toward the total, matching how the
+        S1/S2 files were built.
+        """
+        lineups = list(lineups)
+        if not lineups:
+            return np.array([])
+        heights = np.array([[self.inches(p) or 0 for p in lineup] for lineup in lineups], dtype=float)
+        return heights.sum(axis=1) / heights.shape[1]
+
+    def lineup_average(self, lineup):
+        return float(self.lineup_averages([lineup])[0])
+
+    def report_unresolved(self):
+        if self.unresolved:
+            print(f"[⚠️ Height Error] Could not resolve height for {len(self.unresolved)} players: {sorted(self.unresolved)}")
+
+
+class PlayerIndex:
+    """
+    Player identity index: player_id -> canonical name, team, position and height in inches.
+
+    Built once from the season's active player file (player_id, names, position, team) and
+    the balldontlie file (heights, joined on name). Names fall back to nba_api's static
+    player list, and ids that resolve nowhere are counted in `misses`.
+
+    Args:
+        active_df: active players (active25.csv).
+        bdl_df: balldontlie players (playersBDL25.csv).
+        static_players: nba_api static players list ({'id', 'full_name', ...}).
+    """
+
+    def __init__(self, active_df, bdl_df, static_players=()):
+        active_df = active_df.drop_duplicates('player_id', keep='first')
+        self.height_index = HeightIndex(bdl_df)
+
+        self.names = {}
+        self.teams = {}
+        self.positions = {}
+        self.heights = {}
+        for player_id, first, last, position, team in zip(
+            active_df['player_id'], active_df['first_name'], active_df['last_name'],
+            active_df['position'], active_df['team_abbreviation'],
+        ):
+            if not isinstance(first, str) or not isinstance(last, str):
+                continue
+            player_id = int(player_id)
+            self.names[player_id] = first + ' ' + last
+            self.teams[player_id] = team if isinstance(team, str) else None
+            self.positions[player_id] = position if isinstance(position, str) else None
+            self.heights[player_id] = self.height_index.by_name.get(first + ' ' + last)
+
+        self.static_names = {int(p['id']): p['full_name'] for p in static_players}
+        self.misses = Counter()
+
+    @classmethod
+    def from_files(cls, active_path, bdl_path):
+        from nba_api.stats.static import players
+        return cls(pd.read_csv(active_path), pd.read_csv(bdl_path), players.get_players())
+
+    def name(self, player_id):
+        """Canonical name for a player id: active file first, then nba_api static players."""
+        name = self.names.get(player_id)
+        if name is None:
+            name = self.static_names.get(player_id)
+            if name is None:
+                self.misses[player_id] += 1
+        return name
+
+    def team(self, player_id):
+        return self.teams.get(player_id)
+
+    def position(self, player_id):
+        return self.positions.get(player_id)
+
+    def height(self, player_id):
+        return self.heights.get(player_id)
+
+    def report_misses(self):
+        if self.misses:
+            print(f"[⚠️ Player Index] {len(self.misses)} player ids not found ({sum(self.misses.values())} lookups): {sorted(self.misses)}")
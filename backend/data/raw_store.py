@@ -0,0 +1,91 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class RawPayloadStore:
+    """
+    Content-addressed, gzip-compressed store of raw NBA API payloads.
+
+    Payloads live under objects/<sha256[:2]>/<sha256>.json.gz and manifest.jsonl maps
+    each (endpoint, game_id) to the hash of its payload. The manifest is append-only,
+    so an interrupted run never loses entries that were already written.
+
+    Args:
+        root: directory that holds the store.
+    """
+
+    def __init__(self, root='raw'):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.manifest_path = os.path.join(root, 'manifest.jsonl')
+        self.lock = threading.Lock()
+        self.manifest = {}
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    # Skip a torn last line left behind by a crash
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.manifest[(entry['endpoint'], entry['game_id'])] = entry
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f'{digest}.json.gz')
+
+    def has(self, endpoint, game_id):
+        return (endpoint, str(game_id)) in self.manifest
+
+    def digest(self, endpoint, game_id):
+        entry = self.manifest.get((endpoint, str(game_id)))
+        return entry['sha256'] if entry else None
+
+    def get(self, endpoint, game_id):
+        """Return the cached payload for a game's endpoint, or None if it isn't cached."""
+        entry = self.manifest.get((endpoint, str(game_id)))
+        if entry is None:
+            return None
+        path = self.object_path(entry['sha256'])
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rb') as f:
+            return json.loads(f.read())
+
+    def put(self, endpoint, game_id, payload):
+        """Store a payload and record it in the manifest. Returns the payload's sha256."""
+        data = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+
+        with self.lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + '.tmp'
+                with gzip.open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+
+            entry = {
+                'endpoint': endpoint,
+                'game_id': str(game_id),
+                'sha256': digest,
+                'bytes': len(data),
+                'stored_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            if self.manifest.get((endpoint, str(game_id)), {}).get('sha256') != digest:
+                with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + '\n')
+                self.manifest[(endpoint, str(game_id))] = entry
+        return digest
+
+    def game_ids(self, endpoint):
+        """Sorted game ids that have a cached payload for the endpoint."""
+        return sorted(game_id for (name, game_id) in self.manifest if name == endpoint)
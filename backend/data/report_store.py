@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import pandas as pd
+from lineup_store import STORE_DIR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS edges (
+    report_date TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    team TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    advantage REAL,
+    rank INTEGER,
+    ci_low REAL,
+    ci_high REAL,
+    PRIMARY KEY (report_date, game_id, team, metric)
+);
+CREATE INDEX IF NOT EXISTS edges_by_team ON edges (team, report_date);
+"""
+
+EDGE_COLUMNS = ['report_date', 'game_id', 'team', 'opponent', 'metric', 'advantage', 'rank', 'ci_low', 'ci_high']
+
+# Columns added after the first schema, added to older report files on connect
+ADDED_COLUMNS = {'ci_low': 'REAL', 'ci_high': 'REAL'}
+
+
+class ReportStore:
+    """
+    Pregame report edges kept in SQLite, one row per (report_date, game_id, team, metric).
+
+    A day's report is written in one transaction that first removes that day's rows, so
+    re-running a day replaces it instead of adding duplicates. Indexed for a day's report
+    and for a team's edge history.
+
+    Args:
+        path: SQLite file (defaults to data/store/reports.db).
+    """
+
+    def __init__(self, path=os.path.join(STORE_DIR, 'reports.db')):
+        self.path = path
+        self.conn = None
+
+    def connect(self):
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.executescript(SCHEMA)
+            existing = {row[1] for row in self.conn.execute("PRAGMA table_info(edges)")}
+            with self.conn:
+                for name, kind in ADDED_COLUMNS.items():
+                    if name not in existing:
+                        self.conn.execute(f"ALTER TABLE edges ADD COLUMN {name} {kind}")
+        return self.conn
+
+    def save_day(self, report_date, edges):
+        """
+        Replace a day's edges.
+
+        Args:
+            report_date: 'YYYY-MM-DD'.
+            edges: iterable of dicts with game_id, team, opponent, metric, advantage and rank,
+                plus the bootstrap interval as ci_low/ci_high when there is one.
+        """
+        rows = [(report_date, str(e['game_id']), e['team'], e['opponent'], e['metric'], float(e['advantage']), int(e['rank']),
+                 optional_float(e.get('ci_low')), optional_float(e.get('ci_high')))
+                for e in edges]
+        conn = self.connect()
+        with conn:
+            conn.execute("DELETE FROM edges WHERE report_date = ?", (report_date,))
+            conn.executemany(f"INSERT INTO edges ({', '.join(EDGE_COLUMNS)}) VALUES ({', '.join('?' * len(EDGE_COLUMNS))})", rows)
+
+    def day(self, report_date):
+        """All edges of a day's report, by game and rank."""
+        return self.query("WHERE report_date = ? ORDER BY game_id, rank", (report_date,))
+
+    def team_history(self, team, metric=None):
+        """A team's edges over time, optionally for one metric."""
+        if metric is None:
+            return self.query("WHERE team = ? ORDER BY report_date, metric", (team,))
+        return self.query("WHERE team = ? AND metric = ? ORDER BY report_date", (team, metric))
+
+    def query(self, where, params):
+        return pd.read_sql_query(f"SELECT {', '.join(EDGE_COLUMNS)} FROM edges {where}", self.connect(), params=params)
+
+
+def optional_float(value):
+    return None if value is None or value != value else float(value)
+
+
+# Shared report store
+REPORTS = ReportStore()
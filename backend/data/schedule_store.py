@@ -0,0 +1,150 @@
+import bisect
+import os
+import time
+from datetime import datetime
+import pandas as pd
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# season folder -> (nba_api season, schedule file)
+SCHEDULE_FILES = {
+    'S1': ('2024-25', os.path.join(DATA_DIR, 'S1', 'schedule_2024_25.csv')),
+    'S2': ('2025-26', os.path.join(DATA_DIR, 'S2', 'schedule_2025_26.csv')),
+}
+
+COLUMNS = ['game_id', 'date', 'game_time', 'game_status', 'home_team', 'away_team', 'home_score', 'away_score']
+
+# ScheduleLeagueV2 gameStatus of a finished game
+FINAL = 3
+
+
+def fetch_schedule(season):
+    """Regular season games of a season from ScheduleLeagueV2, in the local store's columns."""
+    from nba_api.stats.endpoints import scheduleleaguev2
+    df = scheduleleaguev2.ScheduleLeagueV2(league_id='00', season=season).get_data_frames()[0]
+    df = df[df['gameId'].str.startswith('0022')]
+
+    return pd.DataFrame({
+        'game_id': df['gameId'],
+        'date': pd.to_datetime(df['gameDate']).dt.strftime('%Y-%m-%d'),
+        'game_time': df['gameStatusText'],
+        'game_status': df['gameStatus'],
+        'home_team': df['homeTeam_teamTricode'],
+        'away_team': df['awayTeam_teamTricode'],
+        'home_score': df['homeTeam_score'].where(df['gameStatus'] == FINAL),
+        'away_score': df['awayTeam_score'].where(df['gameStatus'] == FINAL),
+    }).sort_values(['date', 'game_id']).reset_index(drop=True)
+
+
+class ScheduleStore:
+    """
+    Season schedule kept on disk, indexed by date and by team.
+
+    Loaded once from the schedule file; refresh() re-downloads it from ScheduleLeagueV2.
+    Everything else (today's slate, a team's previous/next game, rest days) is answered
+    from memory, so reports keep working without network access. Only ingestion downloads
+    (load(download=True)); without a file, readers get an empty schedule instead.
+
+    Args:
+        season: season folder ('S1' or 'S2').
+    """
+
+    def __init__(self, season='S2'):
+        self.season = season
+        self.api_season, self.path = SCHEDULE_FILES[season]
+        self.games = None
+        self.by_date = {}
+        self.by_team = {}
+
+    def load(self, max_age_hours=None, download=False):
+        """
+        Load the schedule file (once).
+
+        Args:
+            max_age_hours: with download, also re-download if the file is older than this (None keeps any file).
+            download: fetch the schedule from ScheduleLeagueV2 if the file is missing (or too old).
+        """
+        if download:
+            stale = max_age_hours is not None and os.path.exists(self.path) and \
+                time.time() - os.path.getmtime(self.path) > max_age_hours * 3600
+            if not os.path.exists(self.path) or stale:
+                return self.refresh()
+        if self.games is None:
+            self.reload()
+        return self
+
+    def reload(self):
+        """Re-read the schedule file, e.g. after another process refreshed it (empty if there is none)."""
+        if not os.path.exists(self.path):
+            print(f"Warning: no schedule file at {self.path}, run data25.py (or SCHEDULE.refresh()) to download it")
+            self.index(pd.DataFrame(columns=COLUMNS))
+            return self
+        self.index(pd.read_csv(self.path, dtype={'game_id': str}))
+        return self
+
+    def refresh(self):
+        """Re-download the schedule and swap in the new file."""
+        games = fetch_schedule(self.api_season)
+        tmp_path = self.path + '.tmp'
+        games.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        self.index(games)
+        return self
+
+    def index(self, games):
+        self.games = games.reset_index(drop=True)
+        self.by_date = {d: df for d, df in self.games.groupby('date')}
+
+        # team -> game rows in date order, plus their dates for bisecting
+        self.by_team = {}
+        for side in ('home_team', 'away_team'):
+            for team, df in self.games.groupby(side):
+                self.by_team.setdefault(team, []).append(df)
+        self.by_team = {
+            team: pd.concat(frames).sort_values(['date', 'game_id']).reset_index(drop=True)
+            for team, frames in self.by_team.items()
+        }
+        self.team_dates = {team: df['date'].tolist() for team, df in self.by_team.items()}
+
+    def games_on(self, day):
+        """Games on a date (datetime/date or 'YYYY-MM-DD'), in game_id order."""
+        self.load()
+        return self.by_date.get(as_key(day), self.games.iloc[0:0])
+
+    def game_ids(self):
+        self.load()
+        return self.games['game_id'].tolist()
+
+    def teams(self):
+        self.load()
+        return sorted(self.by_team)
+
+    def previous_game(self, team, day):
+        """A team's last game before day (a row of the schedule), or None."""
+        self.load()
+        dates = self.team_dates.get(team, [])
+        i = bisect.bisect_left(dates, as_key(day))
+        return self.by_team[team].iloc[i - 1] if i > 0 else None
+
+    def next_game(self, team, day):
+        """A team's first game on or after day, or None."""
+        self.load()
+        dates = self.team_dates.get(team, [])
+        i = bisect.bisect_left(dates, as_key(day))
+        return self.by_team[team].iloc[i] if i < len(dates) else None
+
+    def rest_days(self, team, day):
+        """Full days off before a game on day (0 = back-to-back), or None for a team's first game."""
+        previous = self.previous_game(team, day)
+        if previous is None:
+            return None
+        gap = datetime.strptime(as_key(day), '%Y-%m-%d') - datetime.strptime(previous['date'], '%Y-%m-%d')
+        return gap.days - 1
+
+
+def as_key(day):
+    return day if isinstance(day, str) else day.strftime('%Y-%m-%d')
+
+
+# Shared current-season schedule
+SCHEDULE = ScheduleStore('S2')
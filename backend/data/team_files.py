@@ -0,0 +1,48 @@
+import os
+import pandas as pd
+
+
+def assign_game_numbers(df):
+    """Sort a team's rows by game and number its games 1..n in schedule order."""
+    df = df.sort_values('game_id', kind='stable').reset_index(drop=True)
+    game_id_map = {game_id: i + 1 for i, game_id in enumerate(df['game_id'].unique())}
+    df['game_number'] = df['game_id'].map(game_id_map)
+    return df
+
+
+def write_team_games(csv_path, rows, columns):
+    """
+    Write a batch of lineup rows into a team file, replacing any rows it already has for those games.
+
+    Writing the same batch twice gives the same file. The result is written to a temp file
+    and swapped in, so a crash mid-write never leaves a truncated team file behind.
+
+    Args:
+        csv_path: team CSV to update.
+        rows: DataFrame of new lineup rows for one or more games.
+        columns: column order for the file (game_number is appended).
+
+    Returns:
+        df: the team's full DataFrame as written
+        replaced: rows that were in the file for the batch's games before (None if the file is new)
+    """
+    rows = rows[columns].copy()
+    rows['game_id'] = rows['game_id'].astype(int)
+
+    replaced = None
+    if os.path.exists(csv_path):
+        existing = pd.read_csv(csv_path, float_precision='round_trip')
+        in_batch = existing['game_id'].isin(rows['game_id'])
+        replaced = existing[in_batch]
+        existing = existing[~in_batch]
+        existing = existing.drop(columns='game_number', errors='ignore')
+        df = pd.concat([existing, rows], ignore_index=True) if not existing.empty else rows
+    else:
+        df = rows
+
+    df = assign_game_numbers(df)
+
+    tmp_path = csv_path + '.tmp'
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, csv_path)
+    return df, replaced
@@ -0,0 +1,206 @@
+# API for the frontend: players, lineup stats and the pregame report.
+# Run from the backend folder: uvicorn main:app --reload
+from contextlib import asynccontextmanager
+import os
+import sys
+import threading
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
+
+# The ingestion helpers live next to the data files
+sys.path.append(DATA_DIR)
+from data_snapshot import SNAPSHOT
+from lineup_export import EXPORT_FORMATS, arrow_chunks, ndjson_chunks
+import report
+from report_cache import REPORT_CACHE
+from response_cache import RESPONSES
+
+# Season picker value -> season folder
+SEASONS = {
+    '2024-25': 'S1',
+    '2025-26': 'S2',
+}
+
+# Largest page /lineup-stats returns
+MAX_PAGE_SIZE = 100
+
+# Longest a request waits for the first report after startup
+FIRST_REPORT_TIMEOUT = 120
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Data is parsed once into a snapshot before the first request and swapped after each
+    # ingestion batch; the day's report is built at startup and kept current in the background
+    SNAPSHOT.start()
+    REPORT_CACHE.start()
+    yield
+    REPORT_CACHE.stop()
+    SNAPSHOT.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=['*'],
+    allow_methods=['GET', 'POST'],
+    allow_headers=['*'],
+)
+
+
+def csv_list(value, cast=str):
+    """'a,b,c' query parameter as a list (None if empty)."""
+    if value is None or value.strip() == '':
+        return None
+    return [cast(item.strip()) for item in value.split(',') if item.strip()]
+
+
+def parse_periods(value):
+    """periods query parameter ("1,2,5") as a list of ints >= 1, or a 400."""
+    try:
+        periods = csv_list(value, int)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"periods must be comma-separated integers, got {value!r}")
+    if periods is not None and any(period < 1 for period in periods):
+        raise HTTPException(status_code=400, detail=f"periods start at 1, got {value!r}")
+    return periods
+
+
+# Responses carry an ETag of the data they come from (see response_cache.py), so
+# repeat loads are 304s until the snapshot or report they were built from changes
+
+@app.get('/players')
+def players(request: Request):
+    snapshot = SNAPSHOT.get()
+    return RESPONSES.respond(request, ('players', snapshot.version[1]), snapshot.built_at, lambda: snapshot.players)
+
+
+@app.get('/injuries')
+def injuries(request: Request):
+    snapshot = SNAPSHOT.get()
+    return RESPONSES.respond(request, ('injuries', snapshot.version[2]), snapshot.built_at, lambda: snapshot.injuries)
+
+
+@app.get('/lineup-stats/{team}')
+def lineup_stats(
+    request: Request,
+    team: str,
+    season: str = '2025-26',
+    periods: str = None,
+    game_min: int = 1,
+    game_max: int = 82,
+    min_minutes: float = None,
+    max_minutes: float = None,
+    sort_by: str = 'minutes_played',
+    order: str = Query('desc', pattern='^(asc|desc)$'),
+    scale: str = Query('total', pattern='^(total|per_minute|per_100)$'),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    One page of lineups, filtered, summed and sorted on the server.
+
+    team is a tricode, a comma-separated list of tricodes ("ATL,BOS") or ALL.
+    """
+    if season not in SEASONS:
+        raise HTTPException(status_code=404, detail=f"Unknown season {season}")
+    teams = None if team.upper() == 'ALL' else csv_list(team.upper())
+    period_list = parse_periods(periods)
+    snapshot = SNAPSHOT.get()
+    index = snapshot.lineups[SEASONS[season]]
+    if sort_by not in index.sort_keys():
+        raise HTTPException(status_code=400, detail=f"Unknown sort_by {sort_by!r}")
+
+    def page_content():
+        total, rows = index.query(
+            teams=teams,
+            periods=period_list,
+            game_range=(game_min, game_max),
+            min_minutes=min_minutes,
+            max_minutes=max_minutes,
+            sort_by=sort_by,
+            order=order,
+            scale=scale,
+            page=page,
+            page_size=page_size,
+        )
+        return {'total': total, 'page': page, 'page_size': page_size, 'rows': rows}
+
+    return RESPONSES.respond(request, ('lineup-stats', snapshot.version[0]), snapshot.built_at, page_content)
+
+
+@app.get('/pregame-reports')
+def pregame_reports(request: Request, sitting: str = None):
+    """
+    The last finished pregame report; never waits on a rebuild in progress.
+
+    sitting is a comma-separated list of player names ("Player A,Player B"): a "what if they sit"
+    report is then built for this request, on top of the injury list, and never cached.
+    """
+    sitting_list = csv_list(sitting)
+    if sitting_list:
+        unknown = [name for name in sitting_list if name not in report.LINEUPS.codes]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown players {', '.join(unknown)}")
+        df = report.report_data(sitting=sitting_list, raise_errors=True)
+        return df.where(df.notna(), None).to_dict('records')
+
+    current = REPORT_CACHE.get(timeout=FIRST_REPORT_TIMEOUT)
+    if current is None:
+        return JSONResponse(status_code=503, content={'error': 'Pregame reports are still being built', 'details': 'Try again shortly'})
+    response = RESPONSES.respond(request, ('pregame-reports', current.version, current.number), current.built_at, lambda: current.records)
+    response.headers['X-Report-Version'] = str(current.number)
+    return response
+
+
+@app.post('/pregame-reports/refresh')
+def refresh_pregame_reports():
+    """Start a rebuild now (e.g. right after an ingestion batch); the current report keeps being served."""
+    started = threading.Thread(target=REPORT_CACHE.refresh, kwargs={'force': True}, daemon=True)
+    started.start()
+    return {'refreshing': True}
+
+
+@app.get('/export/lineups')
+def export_lineups(
+    seasons: str = '2025-26',
+    teams: str = None,
+    periods: str = None,
+    game_min: int = None,
+    game_max: int = None,
+    format: str = Query('ndjson', pattern='^(arrow|ndjson)$'),
+):
+    """
+    Lineup stint rows streamed as Arrow IPC or NDJSON, chunk by chunk from the lineup store.
+
+    seasons, teams and periods are comma-separated ("2024-25,2025-26", "ATL,BOS", "1,2").
+    """
+    season_list = csv_list(seasons) or []
+    unknown = [season for season in season_list if season not in SEASONS]
+    if unknown or not season_list:
+        raise HTTPException(status_code=404, detail=f"Unknown season {', '.join(unknown) or seasons}")
+    folders = [SEASONS[season] for season in season_list]
+
+    game_numbers = None
+    if game_min is not None or game_max is not None:
+        game_numbers = (game_min if game_min is not None else 1, game_max if game_max is not None else 82)
+
+    period_list = parse_periods(periods)
+    chunks = arrow_chunks if format == 'arrow' else ndjson_chunks
+    try:
+        stream = chunks(folders, teams=csv_list(teams and teams.upper()), game_numbers=game_numbers, periods=period_list)
+        first = next(stream, b'')
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    def body():
+        yield first
+        yield from stream
+
+    filename = f"lineups.{'arrows' if format == 'arrow' else 'ndjson'}"
+    return StreamingResponse(body(), media_type=EXPORT_FORMATS[format],
+                             headers={'Content-Disposition': f'attachment; filename="{filename}"'})
@@ -0,0 +1,110 @@
+# Pregame report kept in memory and rebuilt in the background.
+# The API serves the last finished report; a rebuild runs when the day, the ingested
+# lineup data, the injury list or the schedule file change. A failed rebuild keeps the previous report.
+from collections import namedtuple
+from datetime import date, datetime
+import threading
+import report
+from data_snapshot import data_version
+from lineup_aggregates import file_stamp
+from schedule_store import SCHEDULE
+
+# How often the inputs are checked for changes (a few stat calls, no rebuild)
+CHECK_SECONDS = 60
+
+# One finished report: the inputs it was built from, when, and its rows
+ReportVersion = namedtuple('ReportVersion', ['version', 'number', 'built_at', 'records'])
+
+
+def input_version():
+    """
+    What the day's report depends on: the date, the lineup data, the injury list and the schedule file.
+
+    Lineup data is the ingestion marker (as for the API's data snapshot), so a check that
+    lands in the middle of an ingestion batch doesn't build from half-written team files.
+    """
+    return (
+        date.today().isoformat(),
+        data_version()[0],
+        str(file_stamp(report.INJURIES_PATH)),
+        str(file_stamp(SCHEDULE.path)),
+    )
+
+
+class ReportCache:
+    """
+    The day's pregame report, built off the request path.
+
+    get() returns the current ReportVersion without waiting on a rebuild: requests that
+    arrive while a new report is being built get the previous one, and so do all requests
+    after a build that failed. Only the very first request after startup waits for the first build.
+
+    Game times and statuses come from the schedule file, so they change when ingestion
+    re-downloads it (data25.py), not on a timer.
+    """
+
+    def __init__(self, check_seconds=CHECK_SECONDS):
+        self.check_seconds = check_seconds
+        self.current = None
+        self.ready = threading.Event()
+        self.building = threading.Lock()
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def get(self, timeout=None):
+        self.ready.wait(timeout)
+        return self.current
+
+    def refresh(self, force=False):
+        """
+        Rebuild the report if its inputs changed (or force). Returns False if a build is already running.
+
+        A build that fails raises and leaves current as it was.
+        """
+        if not self.building.acquire(blocking=False):
+            return False
+        try:
+            version = input_version()
+            current = self.current
+            stale = current is None or current.version != version
+            if not (force or stale):
+                return True
+
+            if current is not None and current.version[1] != version[1]:
+                # New games can register new players; labels and masks need their codes
+                report.load_registry()
+            if current is not None and current.version[2] != version[2]:
+                report.load_injuries()
+            if current is not None and current.version[3] != version[3]:
+                SCHEDULE.reload()
+
+            df = report.report_data(raise_errors=True)
+            records = df.where(df.notna(), None).to_dict('records')
+            number = 1 if current is None else current.number + 1
+            self.current = ReportVersion(version, number, datetime.now(), records)
+            self.ready.set()
+            return True
+        finally:
+            self.building.release()
+
+    def run(self):
+        while not self.stopping.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[⚠️ Report Cache] Refresh failed: {e}")
+            self.stopping.wait(self.check_seconds)
+
+    def start(self):
+        """Build the first report and keep it current from a daemon thread."""
+        if self.thread is None or not self.thread.is_alive():
+            self.stopping.clear()
+            self.thread = threading.Thread(target=self.run, name='report-refresh', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+
+
+# Shared report cache of the API server
+REPORT_CACHE = ReportCache()
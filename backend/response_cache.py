@@ -0,0 +1,121 @@
+# Conditional, precompressed JSON responses for the API.
+# Every response is tagged with the version of the data it came from, so a client that
+# already has it gets a 304, and the encoded/compressed body is built once per version.
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+import gzip
+import hashlib
+import json
+import threading
+from fastapi import Response
+
+# brotli is optional: without it responses are gzip (or plain) only
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+# Encoded bodies kept (one per URL and version, e.g. lineup-stats pages)
+MAX_ENTRIES = 512
+
+
+def etag_for(version):
+    """
+    Weak ETag of a data version. The identity, gzip and br bodies of a version share it,
+    which RFC 9110 allows only for weak validators (strong ones must differ per content-coding).
+    """
+    return 'W/"' + hashlib.sha256(repr(version).encode('utf-8')).hexdigest()[:20] + '"'
+
+
+def not_modified(request, etag, built_at):
+    """If-None-Match (weak comparison) wins over If-Modified-Since, as in RFC 9110."""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return etag.removeprefix('W/') in tags or '*' in tags
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is not None:
+        try:
+            return int(built_at.timestamp()) <= int(parsedate_to_datetime(if_modified_since).timestamp())
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def encode(content):
+    """JSON body by content encoding: identity, plus gzip and br when worth it (and brotli is installed)."""
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+    if len(body) < MIN_COMPRESS_BYTES:
+        return {'identity': body}
+    bodies = {'identity': body, 'gzip': gzip.compress(body, compresslevel=6)}
+    if brotli is not None:
+        bodies['br'] = brotli.compress(body, quality=5)
+    return bodies
+
+
+def pick_encoding(request, bodies):
+    accepted = request.headers.get('accept-encoding', '')
+    accepted = {part.split(';')[0].strip().lower() for part in accepted.split(',')}
+    for encoding in ('br', 'gzip'):
+        if encoding in bodies and encoding in accepted:
+            return encoding
+    return 'identity'
+
+
+class ResponseCache:
+    """
+    Encoded JSON bodies per (URL, data version), served with ETag and Last-Modified.
+
+    respond() answers a matching If-None-Match / If-Modified-Since with an empty 304.
+    Otherwise it serves the cached body for that URL and version, in the best
+    encoding the client accepts. The payload is only computed on a cache miss, and
+    entries of older versions age out of the LRU.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def respond(self, request, version, built_at, content):
+        """
+        Args:
+            request: the incoming Request.
+            version: anything identifying the data the response comes from (hashed into the ETag).
+            built_at: datetime the data was built (Last-Modified).
+            content: no-argument callable returning the JSON payload.
+        """
+        etag = etag_for(version)
+        headers = {
+            'ETag': etag,
+            'Last-Modified': formatdate(built_at.timestamp(), usegmt=True),
+            # Cache, but always revalidate: a repeat load is a 304 until the data changes
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept-Encoding',
+        }
+        if not_modified(request, etag, built_at):
+            return Response(status_code=304, headers=headers)
+
+        key = (request.url.path, request.url.query, etag)
+        with self.lock:
+            bodies = self.entries.get(key)
+            if bodies is not None:
+                self.entries.move_to_end(key)
+        if bodies is None:
+            bodies = encode(content())
+            with self.lock:
+                self.entries[key] = bodies
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+
+        encoding = pick_encoding(request, bodies)
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(content=bodies[encoding], media_type='application/json', headers=headers)
+
+
+# Shared response cache of the API server
+RESPONSES = ResponseCache()
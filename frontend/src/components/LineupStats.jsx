@@ -59,6 +59,7 @@ function LineupStats() {
 
   // UI state
   const [lineupData, setLineupData] = useState([]);
+  const [totalLineups, setTotalLineups] = useState(0);
   const [loading, setLoading] = useState(true);
   const [sortBy, setSortBy] = useState('points');
   const [sortOrder, setSortOrder] = useState('desc');
@@ -107,39 +108,47 @@ function LineupStats() {
     fetchPlayers();
   }, []);
 
-  // Load data with current active filters
+  // Load one page of lineups; filtering, sorting and paging happen on the server
   const loadData = async () => {
     setLoading(true);
     setError(null);
-    const allData = [];
-    
-    for (const team of selectedTeams) {
-      try {
-        const params = {
-          season: selectedSeason,
-          game_min: gameRange[0],
-          game_max: gameRange[1]
-        };
-        if (selectedPeriods.length > 0) {
-          params.periods = selectedPeriods.join(','); // Send as comma-separated string
-        }
-        
-        const response = await axios.get(`http://127.0.0.1:8000/lineup-stats/${team}`, { params });
-        if (response.data && Array.isArray(response.data)) {
-          allData.push(...response.data);
-        }
-      } catch (error) {
-        console.error(`Error loading data for ${team}:`, error);
-        setError(`Failed to load data for ${team}`);
-        break;
+
+    if (selectedTeams.length === 0) {
+      setLineupData([]);
+      setTotalLineups(0);
+      setLoading(false);
+      return;
+    }
+
+    try {
+      const params = {
+        season: selectedSeason,
+        game_min: gameRange[0],
+        game_max: gameRange[1],
+        min_minutes: selectedMinutesRange[0],
+        max_minutes: selectedMinutesRange[1],
+        sort_by: sortBy,
+        order: sortOrder,
+        scale: per100Poss ? 'per_100' : perMinute ? 'per_minute' : 'total',
+        page: currentPage,
+        page_size: recordsPerPage
+      };
+      if (selectedPeriods.length > 0) {
+        params.periods = selectedPeriods.join(','); // Send as comma-separated string
       }
+
+      const response = await axios.get(`http://127.0.0.1:8000/lineup-stats/${selectedTeams.join(',')}`, { params });
+      setLineupData(response.data?.rows ?? []);
+      setTotalLineups(response.data?.total ?? 0);
+    } catch (error) {
+      console.error('Error loading lineup data:', error);
+      setError(`Failed to load data for ${selectedTeams.join(', ')}`);
     }
-    
-    setLineupData(allData);
+
     setLoading(false);
   };
 
-  // Load data on mount and when filters change
+  // Load data on mount and when filters, sorting or the page change
   useEffect(() => {
     loadData();
     // Reset stat type to traditional when switching to 2024-25
@@ -147,7 +156,7 @@ function LineupStats() {
       setStatType('traditional');
     }
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [selectedTeams, selectedPeriods, gameRange, selectedSeason]);
+  }, [selectedTeams, selectedPeriods, gameRange, selectedSeason, selectedMinutesRange, sortBy, sortOrder, perMinute, per100Poss, currentPage]);
 
   const handleShowResults = () => {
     setSelectedTeams(pendingTeams);
@@ -161,6 +170,11 @@ function LineupStats() {
     if (pendingSeason === '2024-25' && statType === 'advanced') {
       setStatType('traditional');
     }
+    // Seasons have different sortable columns (2024-25 has no advanced stats), so go back to the default sort
+    if (pendingSeason !== selectedSeason) {
+      setSortBy('points');
+      setSortOrder('desc');
+    }
     const minVal = pendingMinMinutes.trim() === '' ? defaultMinutes.min : Number(pendingMinMinutes);
     const maxVal = pendingMaxMinutes.trim() === '' ? defaultMinutes.max : Number(pendingMaxMinutes);
     setSelectedMinutesRange([isNaN(minVal) ? defaultMinutes.min : minVal, isNaN(maxVal) ? defaultMinutes.max : maxVal]);
@@ -174,6 +188,7 @@ function LineupStats() {
       setSortBy(column);
       setSortOrder('desc');
     }
+    setCurrentPage(1);
   };
 
   const parseLineup = (lineupStr) => {
@@ -335,36 +350,11 @@ function LineupStats() {
   }
   
 
-  // Apply minutes filter
-  const minutesFiltered = lineupData.filter((row) => {
-    const minutes = row.minutes_played || 0;
-    return minutes >= selectedMinutesRange[0] && minutes <= selectedMinutesRange[1];
-  });
-
-  // Sort and paginate data
-  const sortedData = [...minutesFiltered].sort((a, b) => {
-    let aVal, bVal;
-    if (sortBy === 'pace') {
-      const aUnscaled = a.unscaled_pace ?? 0;
-      const bUnscaled = b.unscaled_pace ?? 0;
-      const aMinutes = a.minutes_played ?? 0;
-      const bMinutes = b.minutes_played ?? 0;
-      aVal = (aMinutes === 0) ? 0 : (aUnscaled * 24) / aMinutes;
-      bVal = (bMinutes === 0) ? 0 : (bUnscaled * 24) / bMinutes;
-    } else if (sortBy === 'team_avg_height') {
-      aVal = a.team_avg_height ?? 0;
-      bVal = b.team_avg_height ?? 0;
-    } else {
-      aVal = getValueForKey(a, sortBy) || 0;
-      bVal = getValueForKey(b, sortBy) || 0;
-    }
-    return sortOrder === 'asc' ? aVal - bVal : bVal - aVal;
-  });
-
-  const totalPages = Math.ceil(sortedData.length / recordsPerPage);
+  // The server returns only the current page, already filtered and sorted
+  const totalPages = Math.max(1, Math.ceil(totalLineups / recordsPerPage));
   const startIndex = (currentPage - 1) * recordsPerPage;
   const endIndex = startIndex + recordsPerPage;
-  const paginatedData = sortedData.slice(startIndex, endIndex);
+  const paginatedData = lineupData;
 
   return (
     <div className="min-h-screen bg-gray-950">
@@ -620,19 +610,19 @@ function LineupStats() {
                       <div className="absolute z-10 w-full mt-1 bg-gray-800 border border-gray-700 rounded-lg shadow-medium">
                         <button
                           className={`w-full px-3 py-2 text-left text-sm rounded-t-lg transition-colors ${!perMinute && !per100Poss ? 'bg-accent-500/20 text-accent-400' : 'text-gray-300 hover:bg-gray-700'}`}
-                          onClick={() => { setPerMinute(false); setPer100Poss(false); setIsScaleDropdownOpen(false); }}
+                          onClick={() => { setPerMinute(false); setPer100Poss(false); setIsScaleDropdownOpen(false); setCurrentPage(1); }}
                         >
                           Total
                         </button>
                         <button
                           className={`w-full px-3 py-2 text-left text-sm transition-colors ${perMinute ? 'bg-accent-500/20 text-accent-400' : 'text-gray-300 hover:bg-gray-700'}`}
-                          onClick={() => { setPerMinute(true); setPer100Poss(false); setIsScaleDropdownOpen(false); }}
+                          onClick={() => { setPerMinute(true); setPer100Poss(false); setIsScaleDropdownOpen(false); setCurrentPage(1); }}
                         >
                           Per Minute
                         </button>
                         <button
                           className={`w-full px-3 py-2 text-left text-sm rounded-b-lg transition-colors ${per100Poss ? 'bg-accent-500/20 text-accent-400' : 'text-gray-300 hover:bg-gray-700'}`}
-                          onClick={() => { setPerMinute(false); setPer100Poss(true); setIsScaleDropdownOpen(false); }}
+                          onClick={() => { setPerMinute(false); setPer100Poss(true); setIsScaleDropdownOpen(false); setCurrentPage(1); }}
                         >
                           Per 100 Poss
                         </button>
@@ -710,7 +700,7 @@ function LineupStats() {
         {/* Pagination Info */}
         <div className="mb-4 flex justify-between items-center">
           <div className="text-sm text-gray-400">
-            Showing {startIndex + 1}-{Math.min(endIndex, sortedData.length)} of {sortedData.length} lineups
+            Showing {totalLineups === 0 ? 0 : startIndex + 1}-{Math.min(endIndex, totalLineups)} of {totalLineups} lineups
           </div>
           <div className="flex space-x-2">
             <button